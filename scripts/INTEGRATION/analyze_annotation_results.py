@@ -12,8 +12,8 @@ Description:
     - Count annotated genes per tool (GO and KEGG terms)
     - Separate GO/KEGG counts for EggNOG
     - Pre- and post-filtering analysis for FANTASIA
-    - Generate pie charts showing annotation percentages
-    - Generate bar charts comparing tool performance
+    - Generate an overview figure of per-tool annotation coverage and a
+      bar chart comparing tool performance
     - Create Venn diagrams showing 2-way and 3-way tool overlaps
     - Generate UpSet plots for comprehensive multi-tool overlap visualization
     - Create heatmaps showing annotation density patterns
@@ -27,17 +27,28 @@ Repository: aaronkiggen/Functional_Annotation_Pipeline
 """
 
 import argparse
+import contextlib
+import functools
+import hashlib
+import io
+import mmap
 import os
+import re
 import sys
-from typing import Dict, Set, Tuple
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
 
 try:
     import pandas as pd
+    import matplotlib
+    matplotlib.use('Agg')  # Non-interactive backend; figures are only saved to file
     import matplotlib.pyplot as plt
+    from matplotlib.colors import ListedColormap
+    from matplotlib.gridspec import GridSpec
     import numpy as np
+    import openpyxl
     from matplotlib_venn import venn2, venn3, venn2_circles, venn3_circles
-    import seaborn as sns
-    from upsetplot import UpSet, from_memberships
+    from upsetplot import UpSet, from_indicators
 except ImportError as e:
     missing_packages = []
     try:
@@ -52,19 +63,64 @@ except ImportError as e:
         from matplotlib_venn import venn2, venn3
     except ImportError:
         missing_packages.append("matplotlib-venn")
-    try:
-        import seaborn as sns
-    except ImportError:
-        missing_packages.append("seaborn")
     try:
         from upsetplot import UpSet
     except ImportError:
         missing_packages.append("upsetplot")
+    try:
+        import openpyxl
+    except ImportError:
+        missing_packages.append("openpyxl")
     
     print("Error: Required packages not found.")
-    print(f"Please install: pip install {' '.join(missing_packages)} openpyxl")
+    print(f"Please install: pip install {' '.join(missing_packages)}")
+    print("Optional (faster Excel reading): pip install python-calamine")
     sys.exit(1)
 
+# Prefer the Rust-based calamine reader for xlsx files; fall back to openpyxl
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = 'calamine'
+except ImportError:
+    EXCEL_ENGINE = 'openpyxl'
+
+# Hold text columns as Arrow-backed strings when pyarrow is available, so
+# string checks run as Arrow compute kernels instead of per-object Python
+try:
+    import pyarrow.parquet as pq
+    STRING_DTYPE = pd.StringDtype('pyarrow')
+except ImportError:
+    pq = None
+    STRING_DTYPE = str
+
+
+# First word of every FASTA header line (the gene/protein ID)
+FASTA_HEADER_ID = re.compile(rb'(?m)^>[ \t]*(\S+)')
+
+# Directory (next to the Excel files) holding Parquet copies of parsed sheets
+CACHE_DIR_NAME = '.cache'
+
+# Directory for the Parquet cache set with --cache-dir; None keeps it in
+# CACHE_DIR_NAME next to each Excel file
+CACHE_DIR = None
+
+# Version of the cached sheet contents; bump it when the way sheets are
+# loaded changes, so entries written by older versions are not reused
+CACHE_VERSION = 2
+
+# Whether parsed sheets are reused from the Parquet cache and kept in memory
+# for repeated reads (opt-in with --cache, so --excel-dir is left untouched
+# by default)
+USE_CACHE = False
+
+# zlib level for saved PNGs; fast compression instead of matplotlib's default
+# level 6, at the cost of slightly larger files
+PNG_COMPRESS_LEVEL = 1
+
+# Excel files up to this size are read into memory in one go before parsing,
+# which avoids many small reads on network filesystems (NFS/Lustre)
+MAX_BUFFERED_EXCEL_BYTES = 500 * 1024 * 1024
+
 
 def parse_fasta_file(fasta_path: str) -> Set[str]:
     """
@@ -82,38 +138,288 @@ def parse_fasta_file(fasta_path: str) -> Set[str]:
         print(f"Error: FASTA file not found: {fasta_path}")
         return genes
     
-    with open(fasta_path, 'r') as f:
-        for line in f:
-            if line.startswith('>'):
-                # Extract first word after '>' as gene/protein ID
-                header = line[1:].strip()
-                gene_id = header.split()[0]
-                genes.add(gene_id)
+    if os.path.getsize(fasta_path) == 0:
+        return genes
+    
+    # Scan the raw bytes for header lines only; sequence lines are never
+    # split or decoded
+    with open(fasta_path, 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        genes = {match.group(1).decode() for match in FASTA_HEADER_ID.finditer(mm)}
     
     return genes
 
 
-def read_per_gene_excel(excel_path: str) -> pd.DataFrame:
+def _cache_key(excel_path: str) -> str:
+    """Prefix of the cache entries for an Excel file."""
+    name = os.path.basename(excel_path)
+    if CACHE_DIR:
+        # A shared --cache-dir can hold Excel files with the same name from
+        # different directories; keep their entries apart
+        path = os.path.abspath(excel_path).encode()
+        name += '.' + hashlib.sha1(path).hexdigest()[:16]
+    return name
+
+
+def get_cache_path(excel_path: str) -> str:
+    """
+    Build the Parquet cache path for an Excel file.
+
+    The cache lives in CACHE_DIR, or by default in a '.cache' directory next
+    to the Excel file, and its name encodes the file's modification time and size (plus CACHE_VERSION),
+    so an updated Excel file never matches a stale cache entry.
+
+    Args:
+        excel_path: Path to Excel file
+
+    Returns:
+        Path to the Parquet cache file
+    """
+    stat = os.stat(excel_path)
+    cache_dir = CACHE_DIR or os.path.join(os.path.dirname(excel_path), CACHE_DIR_NAME)
+    cache_name = (f"{_cache_key(excel_path)}.{stat.st_mtime_ns}.{stat.st_size}"
+                  f".v{CACHE_VERSION}.parquet")
+    return os.path.join(cache_dir, cache_name)
+
+
+def write_cache(df: pd.DataFrame, excel_path: str, cache_path: str):
+    """
+    Write a parsed Excel sheet to the Parquet cache, replacing stale entries.
+
+    Caching is best-effort: if pyarrow is not installed or the directory is
+    not writable, the Excel file is simply parsed again on the next run.
+
+    Args:
+        df: Parsed DataFrame
+        excel_path: Path to the source Excel file
+        cache_path: Path to the Parquet cache file
+    """
+    try:
+        cache_dir = os.path.dirname(cache_path)
+        os.makedirs(cache_dir, exist_ok=True)
+        prefix = _cache_key(excel_path) + '.'
+        for entry in os.scandir(cache_dir):
+            if entry.name.startswith(prefix) and entry.path != cache_path:
+                os.remove(entry.path)
+        df.to_parquet(cache_path, index=False, compression='zstd')
+    except Exception:
+        pass
+
+
+def _has_content(s: pd.Series) -> pd.Series:
+    """Boolean mask of cells containing at least one non-whitespace character."""
+    # Columns read by read_per_gene_excel are already string-typed, so this is
+    # a single compiled scan; missing values count as empty via na=False
+    if not isinstance(s.dtype, pd.StringDtype):
+        s = s.astype('string')
+    return s.str.contains(r'\S', regex=True, na=False)
+
+
+def format_cell(value) -> Optional[str]:
+    """
+    Format a cell value as text, the same way for every reader.
+
+    Whole-number floats lose their '.0' (123.0 -> '123'), as pandas'
+    calamine and openpyxl readers already do for dtype=str, so an ID or
+    count reads the same whichever engine or sidecar produced it.
+
+    Args:
+        value: Cell value as returned by the reader
+
+    Returns:
+        The value as a string, or None for a missing value
+    """
+    if pd.isna(value):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+def cells_to_str(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert non-string columns to text with format_cell.
+
+    Excel sheets read with dtype=str are left as they are; this catches
+    numeric columns from Parquet sidecars.
+
+    Args:
+        df: DataFrame as loaded
+
+    Returns:
+        The same DataFrame with every column holding strings
+    """
+    for col in df.columns:
+        if not pd.api.types.is_string_dtype(df[col]):
+            converted = df[col].map(format_cell)
+            df[col] = converted if STRING_DTYPE is str else converted.astype(STRING_DTYPE)
+    return df
+
+
+def blank_to_na(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Replace empty and whitespace-only cells with missing values.
+
+    Applied once when a sheet is loaded, so the counters can test for
+    annotations with a plain notna().
+
+    Args:
+        df: DataFrame with string columns
+
+    Returns:
+        The same DataFrame with blank cells set to missing
+    """
+    for col in df.columns:
+        df[col] = df[col].where(_has_content(df[col]))
+    return df
+
+
+def read_parquet_columns(parquet_path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Read a Parquet file, loading only the requested columns that it contains.
+
+    Args:
+        parquet_path: Path to Parquet file
+        columns: Columns to load (missing ones are ignored); all if None
+
+    Returns:
+        DataFrame with the requested columns
+    """
+    if columns is None:
+        return pd.read_parquet(parquet_path)
+    if pq is None:
+        df = pd.read_parquet(parquet_path)
+        return df[[c for c in df.columns if c in columns]]
+    available = pq.read_schema(parquet_path).names
+    return pd.read_parquet(parquet_path, columns=[c for c in available if c in columns])
+
+
+def read_excel_columns_openpyxl(source, columns: List[str]) -> pd.DataFrame:
+    """
+    Stream the 'Annotations' sheet with openpyxl, keeping only the given columns.
+
+    Rows are read in read-only mode and only the requested cells are kept,
+    so no DataFrame is built for the unused columns.
+
+    Args:
+        source: Path to Excel file or binary file-like object
+        columns: Columns to load (missing ones are ignored)
+
+    Returns:
+        DataFrame with the requested columns as strings
+    """
+    wb = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = wb['Annotations'].iter_rows(values_only=True)
+        header = next(rows, ())
+        wanted = [(idx, name) for idx, name in enumerate(header) if name in columns]
+        data = {name: [] for _, name in wanted}
+        for row in rows:
+            values = [row[idx] if idx < len(row) else None for idx, _ in wanted]
+            if all(v is None for v in values):
+                continue
+            for (_, name), value in zip(wanted, values):
+                data[name].append(format_cell(value))
+    finally:
+        wb.close()
+    return pd.DataFrame(data, dtype=STRING_DTYPE)
+
+
+def read_per_gene_excel(excel_path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
     """
     Read per-gene Excel file.
-    
+
+    Results are memoized per (path, modification time, columns) for the rest
+    of the run; callers must not modify the returned DataFrame.
+
+    Empty and whitespace-only cells are returned as missing values (see
+    blank_to_na). A Parquet or CSV file with the same stem as the Excel file
+    is read instead when present. Otherwise, parsed sheets are cached as Parquet
+    (see get_cache_path), so repeated runs on unchanged Excel files skip the
+    slow xlsx parsing. Each per-gene file is read by a single counter, so
+    the cache only holds the columns that counter asked for. Both caches
+    are only used when USE_CACHE is on (--cache).
+
     Args:
         excel_path: Path to Excel file
-        
+        columns: Columns to load (missing ones are ignored); all if None
+
     Returns:
         DataFrame with gene annotations
     """
     if not os.path.exists(excel_path):
         print(f"Warning: File not found: {excel_path}")
         return pd.DataFrame()
-    
+
+    if not USE_CACHE:
+        return _load_per_gene_excel(excel_path, columns)
+    return _load_per_gene_excel_memoized(os.path.abspath(excel_path),
+                                         os.stat(excel_path).st_mtime_ns,
+                                         None if columns is None else tuple(columns))
+
+
+@functools.lru_cache(maxsize=32)
+def _load_per_gene_excel_memoized(excel_path: str, mtime_ns: int,
+                                  columns: Optional[Tuple[str, ...]]) -> pd.DataFrame:
+    """Memoized _load_per_gene_excel; mtime_ns only serves as part of the key."""
+    return _load_per_gene_excel(excel_path, None if columns is None else list(columns))
+
+
+def _load_per_gene_excel(excel_path: str, columns: Optional[List[str]]) -> pd.DataFrame:
+    """Load a per-gene sheet from a sidecar, the Parquet cache or the Excel file."""
+    # Prefer a Parquet or CSV sidecar with the same stem, which is far
+    # cheaper to parse than xlsx
+    usecols = None if columns is None else (lambda c: c in columns)
+    stem = os.path.splitext(excel_path)[0]
+    for ext in ('.parquet', '.csv'):
+        sidecar = stem + ext
+        if not os.path.exists(sidecar):
+            continue
+        try:
+            if ext == '.parquet':
+                df = read_parquet_columns(sidecar, columns)
+            else:
+                df = pd.read_csv(sidecar, engine='c', dtype=STRING_DTYPE, usecols=usecols)
+            print(f"  (using {ext} sidecar)")
+            return blank_to_na(cells_to_str(df))
+        except Exception as e:
+            print(f"Warning: Could not read {sidecar}: {e}")
+
+    cache_path = get_cache_path(excel_path)
+    if USE_CACHE and os.path.exists(cache_path):
+        try:
+            return read_parquet_columns(cache_path, columns)
+        except Exception:
+            pass
+
     try:
-        df = pd.read_excel(excel_path, sheet_name='Annotations')
-        return df
+        source = excel_path
+        if os.path.getsize(excel_path) <= MAX_BUFFERED_EXCEL_BYTES:
+            with open(excel_path, 'rb') as f:
+                source = io.BytesIO(f.read())
+        df = None
+        if EXCEL_ENGINE == 'calamine':
+            try:
+                df = pd.read_excel(source, sheet_name='Annotations',
+                                   engine='calamine', dtype=STRING_DTYPE, usecols=usecols)
+            except Exception as e:
+                print(f"Warning: calamine could not read {excel_path} ({e}); retrying with openpyxl")
+                if hasattr(source, 'seek'):
+                    source.seek(0)
+        if df is None and columns is not None:
+            df = read_excel_columns_openpyxl(source, columns)
+        elif df is None:
+            df = pd.read_excel(source, sheet_name='Annotations',
+                               engine='openpyxl', dtype=STRING_DTYPE, usecols=usecols)
     except Exception as e:
         print(f"Error reading {excel_path}: {e}")
         return pd.DataFrame()
 
+    df = blank_to_na(cells_to_str(df))
+    if USE_CACHE:
+        write_cache(df, excel_path, cache_path)
+    return df
+
 
 def count_annotated_genes_kofamscan(excel_path: str) -> Tuple[Set[str], int]:
     """
@@ -125,13 +431,13 @@ def count_annotated_genes_kofamscan(excel_path: str) -> Tuple[Set[str], int]:
     Returns:
         Tuple of (set of annotated genes, count)
     """
-    df = read_per_gene_excel(excel_path)
+    df = read_per_gene_excel(excel_path, columns=['gene_name', 'KEGG'])
     if df.empty:
         return set(), 0
     
     # Genes with non-empty KEGG terms
-    annotated = df[df['KEGG'].notna() & (df['KEGG'].astype(str).str.strip() != '')]
-    annotated_genes = set(annotated['gene_name'].unique())
+    annotated = df[df['KEGG'].notna()]
+    annotated_genes = set(annotated['gene_name'].to_numpy())
     
     return annotated_genes, len(annotated_genes)
 
@@ -146,18 +452,14 @@ def count_annotated_genes_interproscan(excel_path: str) -> Tuple[Set[str], int]:
     Returns:
         Tuple of (set of annotated genes, count)
     """
-    df = read_per_gene_excel(excel_path)
+    df = read_per_gene_excel(excel_path, columns=['gene', 'GO', 'Pathways'])
     if df.empty:
         return set(), 0
     
     # Genes with GO terms or Pathways
-    def has_annotation(row):
-        has_go = pd.notna(row['GO']) and str(row['GO']).strip() != ''
-        has_pathway = pd.notna(row['Pathways']) and str(row['Pathways']).strip() != ''
-        return has_go or has_pathway
-    
-    annotated = df[df.apply(has_annotation, axis=1)]
-    annotated_genes = set(annotated['gene'].unique())
+    go_mask = df['GO'].notna()
+    pw_mask = df['Pathways'].notna()
+    annotated_genes = set(df.loc[go_mask | pw_mask, 'gene'].to_numpy())
     
     return annotated_genes, len(annotated_genes)
 
@@ -170,29 +472,38 @@ def count_annotated_genes_eggnog(excel_path: str) -> Dict[str, Tuple[Set[str], i
         excel_path: Path to EggNOG per-gene Excel file
         
     Returns:
-        Dictionary with 'GO' and 'KEGG' keys, each containing (set of genes, count)
+        Dictionary with 'GO', 'KEGG' and 'combined' (GO or KEGG) keys, each
+        containing (set of genes, count)
     """
-    df = read_per_gene_excel(excel_path)
+    columns = ['gene', '#query', 'GOs', 'KEGG_ko']
+    df = read_per_gene_excel(excel_path, columns=columns)
     if df.empty:
-        return {'GO': (set(), 0), 'KEGG': (set(), 0)}
+        return {'GO': (set(), 0), 'KEGG': (set(), 0), 'combined': (set(), 0)}
     
     # Determine gene column name (could be 'gene' or '#query')
     gene_col = 'gene' if 'gene' in df.columns else '#query' if '#query' in df.columns else None
     if gene_col is None:
         print(f"Warning: Could not find gene column in {excel_path}")
-        return {'GO': (set(), 0), 'KEGG': (set(), 0)}
+        return {'GO': (set(), 0), 'KEGG': (set(), 0), 'combined': (set(), 0)}
+    
+    genes = df[gene_col].to_numpy()
     
-    # GO annotations
-    go_annotated = df[df['GOs'].notna() & (df['GOs'].astype(str).str.strip() != '')]
-    go_genes = set(go_annotated[gene_col].unique())
+    # GO (GOs) and KEGG (KEGG_ko) presence in one pass over both columns
+    present = df[['GOs', 'KEGG_ko']].notna().to_numpy()
+    go_mask = present[:, 0]
+    kegg_mask = present[:, 1]
     
-    # KEGG annotations (check KEGG_ko column)
-    kegg_annotated = df[df['KEGG_ko'].notna() & (df['KEGG_ko'].astype(str).str.strip() != '')]
-    kegg_genes = set(kegg_annotated[gene_col].unique())
+    # Deduplicate in C with pd.unique before building the Python sets
+    go_genes = set(pd.unique(genes[go_mask]))
+    kegg_genes = set(pd.unique(genes[kegg_mask]))
+    
+    # Genes with either GO or KEGG annotations
+    combined_genes = set(pd.unique(genes[go_mask | kegg_mask]))
     
     return {
         'GO': (go_genes, len(go_genes)),
-        'KEGG': (kegg_genes, len(kegg_genes))
+        'KEGG': (kegg_genes, len(kegg_genes)),
+        'combined': (combined_genes, len(combined_genes))
     }
 
 
@@ -206,24 +517,97 @@ def count_annotated_genes_fantasia(excel_path: str) -> Tuple[Set[str], int]:
     Returns:
         Tuple of (set of annotated genes, count)
     """
-    df = read_per_gene_excel(excel_path)
+    df = read_per_gene_excel(excel_path, columns=['gene', 'GO'])
     if df.empty:
         return set(), 0
     
     # Genes with GO terms
-    annotated = df[df['GO'].notna() & (df['GO'].astype(str).str.strip() != '')]
-    annotated_genes = set(annotated['gene'].unique())
+    annotated = df[df['GO'].notna()]
+    annotated_genes = set(annotated['gene'].to_numpy())
     
     return annotated_genes, len(annotated_genes)
 
 
-def analyze_fantasia_models(excel_dir: str, sample_prefix: str) -> Dict:
+# Per-gene counter for each kind of Excel file, run on the worker pool
+TOOL_COUNTERS = {
+    'kofamscan': count_annotated_genes_kofamscan,
+    'interproscan': count_annotated_genes_interproscan,
+    'eggnog': count_annotated_genes_eggnog,
+    'fantasia': count_annotated_genes_fantasia,
+}
+
+
+def _init_loader(use_cache: bool, cache_dir: Optional[str]):
+    """Carry the --cache and --cache-dir settings into a loader worker process."""
+    global USE_CACHE, CACHE_DIR
+    USE_CACHE = use_cache
+    CACHE_DIR = cache_dir
+
+
+def _load_one(kind: str, path: str):
+    """Run the counter for one Excel file (top-level so worker processes can pickle it)."""
+    return TOOL_COUNTERS[kind](path)
+
+
+def worker_pool(jobs: int):
+    """
+    Create the process pool used to parse per-gene Excel files and draw plots.
+    
+    Args:
+        jobs: Number of worker processes; 1 runs everything in this process
+        
+    Returns:
+        Context manager yielding a ProcessPoolExecutor, or None for jobs <= 1
+    """
+    if jobs <= 1:
+        return contextlib.nullcontext()
+    return ProcessPoolExecutor(max_workers=jobs, initializer=_init_loader,
+                               initargs=(USE_CACHE, CACHE_DIR))
+
+
+def submit_task(executor: Optional[ProcessPoolExecutor], fn, *args) -> Future:
+    """
+    Queue fn(*args) on the worker pool.
+    
+    Args:
+        executor: Pool from worker_pool, or None to run fn right away
+        fn: Top-level function (worker processes must be able to pickle it)
+        *args: Arguments for fn
+        
+    Returns:
+        Future holding fn's result
+    """
+    if executor is not None:
+        return executor.submit(fn, *args)
+    future = Future()
+    future.set_result(fn(*args))
+    return future
+
+
+def submit_load(executor: Optional[ProcessPoolExecutor], kind: str, path: str) -> Future:
+    """
+    Queue one Excel file for counting.
+    
+    Args:
+        executor: Pool from worker_pool, or None to count the file right away
+        kind: Key of TOOL_COUNTERS
+        path: Path to the per-gene Excel file
+        
+    Returns:
+        Future holding the counter's result
+    """
+    return submit_task(executor, _load_one, kind, path)
+
+
+def analyze_fantasia_models(excel_dir: str, sample_prefix: str,
+                            executor: Optional[ProcessPoolExecutor] = None) -> Dict:
     """
     Analyze FANTASIA results for all models (pre- and post-filtering).
     
     Args:
         excel_dir: Directory containing Excel files
         sample_prefix: Sample name prefix for file matching
+        executor: Pool from worker_pool to parse the files in
         
     Returns:
         Dictionary with pre- and post-filtering statistics
@@ -234,23 +618,29 @@ def analyze_fantasia_models(excel_dir: str, sample_prefix: str) -> Dict:
         'post_filtering': {}
     }
     
+    # Collect every existing per-gene file (pre- and post-filtering) so they
+    # can be parsed concurrently
+    tasks = []
     for model in models:
-        # Pre-filtering (unfiltered per-gene file)
         pre_file = os.path.join(excel_dir, f"{sample_prefix}_fantasia_{model}_per_gene.xlsx")
-        if os.path.exists(pre_file):
-            genes, count = count_annotated_genes_fantasia(pre_file)
-            results['pre_filtering'][model] = (genes, count)
-        else:
-            results['pre_filtering'][model] = (set(), 0)
-        
-        # Post-filtering (filtered per-gene file)
         post_file = os.path.join(excel_dir, f"{sample_prefix}_fantasia_{model}_per_gene_filtered.xlsx")
-        if os.path.exists(post_file):
-            genes, count = count_annotated_genes_fantasia(post_file)
-            results['post_filtering'][model] = (genes, count)
-        else:
-            # If filtered file doesn't exist, post-filtering same as pre-filtering
-            results['post_filtering'][model] = results['pre_filtering'][model]
+        for phase, path in (('pre_filtering', pre_file), ('post_filtering', post_file)):
+            if os.path.exists(path):
+                tasks.append((model, phase, path))
+    
+    parsed = {}
+    if tasks:
+        futures = {(model, phase): submit_load(executor, 'fantasia', path)
+                   for model, phase, path in tasks}
+        for key, future in futures.items():
+            parsed[key] = future.result()
+    
+    for model in models:
+        # Pre-filtering (unfiltered per-gene file)
+        results['pre_filtering'][model] = parsed.get((model, 'pre_filtering'), (set(), 0))
+        # If filtered file doesn't exist, post-filtering same as pre-filtering
+        results['post_filtering'][model] = parsed.get((model, 'post_filtering'),
+                                                      results['pre_filtering'][model])
     
     return results
 
@@ -261,90 +651,109 @@ def create_annotation_summary(total_genes: int, annotations: Dict) -> pd.DataFra
     
     Args:
         total_genes: Total number of genes in FASTA
-        annotations: Dictionary of annotation statistics
+        annotations: Dictionary of annotated gene counts (tool -> count, or
+            tool -> {subtype: count} for EggNOG)
         
     Returns:
-        DataFrame with summary statistics
+        DataFrame with summary statistics (numeric Percentage_Value; see
+        format_annotation_summary for the displayed table)
     """
-    summary_data = []
+    tools = []
+    counts = []
     
     for tool, data in annotations.items():
-        if isinstance(data, tuple):
-            genes, count = data
-            percentage = (count / total_genes * 100) if total_genes > 0 else 0
-            summary_data.append({
-                'Tool': tool,
-                'Annotated Genes': count,
-                'Total Genes': total_genes,
-                'Percentage': f"{percentage:.2f}%",
-                'Percentage_Value': percentage
-            })
-        elif isinstance(data, dict):
+        if isinstance(data, dict):
             # Handle nested dictionaries (e.g., EggNOG with GO and KEGG)
-            for subtype, (genes, count) in data.items():
-                percentage = (count / total_genes * 100) if total_genes > 0 else 0
-                summary_data.append({
-                    'Tool': f"{tool} ({subtype})",
-                    'Annotated Genes': count,
-                    'Total Genes': total_genes,
-                    'Percentage': f"{percentage:.2f}%",
-                    'Percentage_Value': percentage
-                })
+            for subtype, count in data.items():
+                tools.append(f"{tool} ({subtype})")
+                counts.append(count)
+        else:
+            tools.append(tool)
+            counts.append(data)
+    
+    counts = np.array(counts, dtype=np.int64)
+    return pd.DataFrame({
+        'Tool': tools,
+        'Annotated Genes': counts,
+        'Total Genes': total_genes,
+        'Percentage_Value': (counts / total_genes * 100) if total_genes > 0 else 0.0
+    })
+
+
+def format_annotation_summary(summary_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add the formatted Percentage column for the summary CSV and console table.
     
-    return pd.DataFrame(summary_data)
+    Args:
+        summary_df: DataFrame from create_annotation_summary
+        
+    Returns:
+        Copy of summary_df with a 'Percentage' text column (e.g. "42.00%")
+    """
+    display_df = summary_df.copy()
+    display_df.insert(3, 'Percentage', summary_df['Percentage_Value'].map('{:.2f}%'.format))
+    return display_df
 
 
-def plot_annotation_pie_charts(summary_df: pd.DataFrame, output_path: str):
+def _draw_annotation_coverage(ax: plt.Axes, summary_df: pd.DataFrame):
     """
-    Create pie charts showing annotation percentages for all tools.
+    Draw one horizontal bar per tool, split into annotated and unannotated genes.
     
     Args:
+        ax: Axes to draw on
         summary_df: DataFrame with annotation summary
-        output_path: Path to save the figure
     """
-    # Prepare data for pie charts
-    n_tools = len(summary_df)
+    tools = summary_df['Tool']
+    percentages = summary_df['Percentage_Value']
     
-    # Calculate grid dimensions
-    n_cols = 3
-    n_rows = (n_tools + n_cols - 1) // n_cols
+    annotated_bars = ax.barh(tools, percentages, color='#4CAF50',
+                             edgecolor='black', label='Annotated')
+    ax.barh(tools, 100 - percentages, left=percentages, color='#E0E0E0',
+            edgecolor='black', label='Unannotated')
+    
+    # Label each annotated segment with (annotated/total)
+    ax.bar_label(annotated_bars,
+                 labels=[f"{a}/{t} ({p:.1f}%)" for a, t, p in
+                         zip(summary_df['Annotated Genes'], summary_df['Total Genes'], percentages)],
+                 label_type='edge', padding=3, fontweight='bold')
+    
+    ax.set_xlabel('Percentage of Genes (%)', fontweight='bold', fontsize=12)
+    ax.set_title('Annotated vs. Unannotated Genes by Tool', fontweight='bold', fontsize=14)
+    ax.set_xlim(0, 100)
+    ax.invert_yaxis()
+    ax.legend(loc='upper left', bbox_to_anchor=(1.01, 1))
+
+
+def _draw_annotation_pie(ax: plt.Axes, tool: str, annotated: int, total: int):
+    """
+    Draw a pie chart of annotated vs. unannotated genes for one tool.
     
-    # Create figure with subplots
-    fig = plt.figure(figsize=(15, 5 * n_rows))
+    Args:
+        ax: Axes to draw on
+        tool: Tool name used in the title
+        annotated: Number of annotated genes
+        total: Total number of genes
+    """
+    unannotated = total - annotated
     
-    for idx, row in summary_df.iterrows():
-        ax = fig.add_subplot(n_rows, n_cols, idx + 1)
-        
-        annotated = row['Annotated Genes']
-        total = row['Total Genes']
-        unannotated = total - annotated
-        
-        # Create pie chart
-        sizes = [annotated, unannotated]
-        labels = ['Annotated', 'Unannotated']
-        colors = ['#4CAF50', '#E0E0E0']
-        explode = (0.1, 0)
-        
-        ax.pie(sizes, explode=explode, labels=labels, colors=colors,
-               autopct='%1.1f%%', shadow=True, startangle=90)
-        ax.set_title(f"{row['Tool']}\n({annotated}/{total} genes)", fontweight='bold')
+    # Create pie chart
+    sizes = [annotated, unannotated]
+    labels = ['Annotated', 'Unannotated']
+    colors = ['#4CAF50', '#E0E0E0']
     
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
-    print(f"✓ Saved pie charts: {output_path}")
-    plt.close()
+    ax.pie(sizes, labels=labels, colors=colors,
+           autopct='%1.1f%%', startangle=90)
+    ax.set_title(f"{tool}\n({annotated}/{total} genes)", fontweight='bold')
 
 
-def plot_combined_comparison(summary_df: pd.DataFrame, output_path: str):
+def _draw_tool_comparison(ax: plt.Axes, summary_df: pd.DataFrame):
     """
-    Create combined bar chart comparing all tools.
+    Draw a bar chart comparing annotation percentages across all tools.
     
     Args:
+        ax: Axes to draw on
         summary_df: DataFrame with annotation summary
-        output_path: Path to save the figure
     """
-    fig, ax = plt.subplots(figsize=(12, 6))
-    
     tools = summary_df['Tool']
     percentages = summary_df['Percentage_Value']
     
@@ -366,70 +775,167 @@ def plot_combined_comparison(summary_df: pd.DataFrame, output_path: str):
         ax.text(bar.get_x() + bar.get_width()/2., height,
                 f'{pct:.1f}%',
                 ha='center', va='bottom', fontweight='bold')
+
+
+def plot_annotation_overview(summary_df: pd.DataFrame, output_path: str,
+                             legacy_pies: bool = False):
+    """
+    Create one figure with per-tool annotation coverage and a tool comparison.
     
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
-    print(f"✓ Saved comparison chart: {output_path}")
-    plt.close()
+    The upper part shows annotated vs. unannotated genes per tool as stacked
+    bars (or a grid of pie charts), the bottom row a bar chart comparing
+    annotation percentages. Everything is rendered and saved in one go.
+    
+    Args:
+        summary_df: DataFrame with annotation summary
+        output_path: Path to save the figure
+        legacy_pies: Draw a grid of one pie chart per tool instead of stacked bars
+    """
+    comparison_height = 6
+    
+    if legacy_pies:
+        # Calculate grid dimensions
+        n_cols = 3
+        n_rows = max(1, (len(summary_df) + n_cols - 1) // n_cols)
+        
+        fig = plt.figure(figsize=(15, 5 * n_rows + comparison_height), layout='constrained')
+        gs = GridSpec(n_rows + 1, n_cols, figure=fig,
+                      height_ratios=[5] * n_rows + [comparison_height])
+        
+        rows = zip(summary_df['Tool'].to_numpy(),
+                   summary_df['Annotated Genes'].to_numpy(),
+                   summary_df['Total Genes'].to_numpy())
+        for idx, (tool, annotated, total) in enumerate(rows):
+            ax = fig.add_subplot(gs[idx // n_cols, idx % n_cols])
+            _draw_annotation_pie(ax, tool, annotated, total)
+    else:
+        coverage_height = max(4, 0.5 * len(summary_df))
+        
+        fig = plt.figure(figsize=(12, coverage_height + comparison_height), layout='constrained')
+        gs = GridSpec(2, 1, figure=fig, height_ratios=[coverage_height, comparison_height])
+        _draw_annotation_coverage(fig.add_subplot(gs[0, 0]), summary_df)
+    
+    _draw_tool_comparison(fig.add_subplot(gs[-1, :]), summary_df)
+    
+    fig.savefig(output_path, dpi=300, pil_kwargs={'compress_level': PNG_COMPRESS_LEVEL})
+    print(f"✓ Saved annotation overview: {output_path}")
+    plt.close(fig)
+
+
+def build_gene_index(total_genes_set: Set[str], gene_sets: List[Set[str]]) -> np.ndarray:
+    """
+    Assign every gene a contiguous integer ID.
+    
+    Args:
+        total_genes_set: Set of all genes in the FASTA file
+        gene_sets: Sets of annotated genes (one per tool or model)
+        
+    Returns:
+        Sorted array of all gene IDs (FASTA genes plus any annotated gene);
+        a gene's position in this array is its integer ID
+    """
+    # Deduplicate by sorting the concatenated IDs rather than via a set union
+    return np.unique(np.concatenate([np.array(list(genes), dtype=str)
+                                     for genes in [total_genes_set, *gene_sets]]))
+
+
+def genes_to_bitmap(genes: Set[str], gene_names: np.ndarray) -> np.ndarray:
+    """
+    Convert a gene set into a boolean membership mask over the gene index.
+    
+    Args:
+        genes: Set of gene IDs (all present in gene_names)
+        gene_names: Sorted gene index from build_gene_index
+        
+    Returns:
+        Boolean array with True at the ID of every gene in the set
+    """
+    bitmap = np.zeros(len(gene_names), dtype=bool)
+    bitmap[np.searchsorted(gene_names, np.array(list(genes), dtype=str))] = True
+    return bitmap
 
 
-def calculate_overlaps(gene_sets: Dict[str, Set[str]]) -> Dict:
+def build_annotation_matrix(tool_gene_sets: Dict[str, List[Set[str]]],
+                            gene_names: np.ndarray) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Build one gene x tool boolean matrix with a column per tool.
+    
+    The matrix is column-major, so each tool's column is a contiguous
+    bitmap and per-tool reductions scan memory sequentially.
+    
+    Args:
+        tool_gene_sets: Dictionary mapping tool names to the gene sets whose
+            union forms that tool's column (e.g. all FANTASIA models)
+        gene_names: Sorted gene index from build_gene_index
+        
+    Returns:
+        Tuple of (matrix, dictionary mapping tool names to their column views)
+    """
+    matrix = np.zeros((len(gene_names), len(tool_gene_sets)), dtype=bool, order='F')
+    for col, gene_sets in enumerate(tool_gene_sets.values()):
+        for genes in gene_sets:
+            matrix[np.searchsorted(gene_names, np.array(list(genes), dtype=str)), col] = True
+    return matrix, {tool: matrix[:, col] for col, tool in enumerate(tool_gene_sets)}
+
+
+def calculate_overlaps(annotation_matrix: np.ndarray, gene_bitmaps: Dict[str, np.ndarray]) -> Dict:
     """
     Calculate overlaps between different annotation tools.
     
+    Each tool is a boolean bitmap over the gene index, so unions,
+    intersections and differences are element-wise NumPy operations.
+    
     Args:
-        gene_sets: Dictionary mapping tool names to sets of annotated genes
+        annotation_matrix: Gene x tool matrix from build_annotation_matrix
+        gene_bitmaps: Dictionary mapping tool names to their matrix columns
         
     Returns:
-        Dictionary with overlap statistics
+        Dictionary with overlap statistics, each a (gene bitmap, count) tuple;
+        gene_names[bitmap] gives the gene IDs
     """
     overlaps = {}
+    none = np.zeros(annotation_matrix.shape[0], dtype=bool)
+    has_tools = annotation_matrix.shape[1] > 0
+    
+    def result(mask: np.ndarray) -> Tuple[np.ndarray, int]:
+        return mask, int(np.count_nonzero(mask))
     
     # All tools combined
-    all_tools = set.union(*gene_sets.values()) if gene_sets else set()
-    overlaps['all_tools_combined'] = (all_tools, len(all_tools))
+    overlaps['all_tools_combined'] = result(annotation_matrix.any(axis=1) if has_tools else none)
     
     # Genes annotated by all tools
-    if len(gene_sets) > 0:
-        genes_all_tools = set.intersection(*gene_sets.values())
-        overlaps['annotated_by_all'] = (genes_all_tools, len(genes_all_tools))
-    else:
-        overlaps['annotated_by_all'] = (set(), 0)
+    overlaps['annotated_by_all'] = result(annotation_matrix.all(axis=1) if has_tools else none)
     
     # KofamScan, InterProScan, and EggNOG combined
-    kofam_interpro_eggnog = set()
-    if 'KofamScan' in gene_sets:
-        kofam_interpro_eggnog.update(gene_sets['KofamScan'])
-    if 'InterProScan' in gene_sets:
-        kofam_interpro_eggnog.update(gene_sets['InterProScan'])
-    if 'EggNOG (combined)' in gene_sets:
-        kofam_interpro_eggnog.update(gene_sets['EggNOG (combined)'])
+    main_tools = ['KofamScan', 'InterProScan', 'EggNOG (combined)']
+    main_bitmaps = [gene_bitmaps[tool] for tool in main_tools if tool in gene_bitmaps]
+    kofam_interpro_eggnog = np.logical_or.reduce(main_bitmaps) if main_bitmaps else none
     
-    overlaps['kofam_interpro_eggnog_combined'] = (kofam_interpro_eggnog, len(kofam_interpro_eggnog))
+    overlaps['kofam_interpro_eggnog_combined'] = result(kofam_interpro_eggnog)
     
     # Overlap between KofamScan, InterProScan, and EggNOG (genes in all three)
-    if 'KofamScan' in gene_sets and 'InterProScan' in gene_sets and 'EggNOG (combined)' in gene_sets:
-        overlap_3tools = gene_sets['KofamScan'] & gene_sets['InterProScan'] & gene_sets['EggNOG (combined)']
-        overlaps['kofam_interpro_eggnog_overlap'] = (overlap_3tools, len(overlap_3tools))
+    if len(main_bitmaps) == len(main_tools):
+        overlaps['kofam_interpro_eggnog_overlap'] = result(np.logical_and.reduce(main_bitmaps))
     else:
-        overlaps['kofam_interpro_eggnog_overlap'] = (set(), 0)
+        overlaps['kofam_interpro_eggnog_overlap'] = result(none)
     
     # FANTASIA unique annotations (genes only in FANTASIA, not in the three main tools)
-    if 'FANTASIA (post-filtering)' in gene_sets:
-        fantasia_unique = gene_sets['FANTASIA (post-filtering)'] - kofam_interpro_eggnog
-        overlaps['fantasia_unique'] = (fantasia_unique, len(fantasia_unique))
+    if 'FANTASIA (post-filtering)' in gene_bitmaps:
+        fantasia_unique = gene_bitmaps['FANTASIA (post-filtering)'] & ~kofam_interpro_eggnog
+        overlaps['fantasia_unique'] = result(fantasia_unique)
     else:
-        overlaps['fantasia_unique'] = (set(), 0)
+        overlaps['fantasia_unique'] = result(none)
     
     return overlaps
 
 
-def create_venn_style_summary(overlaps: Dict, output_path: str):
+def create_venn_style_summary(overlaps: Dict, gene_names: np.ndarray, output_path: str):
     """
     Create a text-based summary of overlaps (Venn diagram style).
     
     Args:
         overlaps: Dictionary with overlap statistics
+        gene_names: Sorted gene index from build_gene_index
         output_path: Path to save the summary text file
     """
     with open(output_path, 'w') as f:
@@ -454,96 +960,118 @@ def create_venn_style_summary(overlaps: Dict, output_path: str):
         
         if overlaps['fantasia_unique'][1] > 0:
             f.write("\nExample FANTASIA-unique gene IDs (first 10):\n")
-            for gene in list(overlaps['fantasia_unique'][0])[:10]:
+            for gene in gene_names[np.flatnonzero(overlaps['fantasia_unique'][0])[:10]]:
                 f.write(f"  - {gene}\n")
     
     print(f"✓ Saved overlap summary: {output_path}")
 
 
-def plot_venn_diagrams(gene_sets: Dict[str, Set[str]], output_path: str):
+def venn_region_sizes(bitmaps: List[np.ndarray]) -> Tuple[int, ...]:
+    """
+    Count genes in every region of a 2- or 3-set Venn diagram.
+    
+    Args:
+        bitmaps: Gene bitmaps of the sets, in Venn order (A, B[, C])
+        
+    Returns:
+        Region sizes in matplotlib-venn subset order ((Ab, aB, AB) for two
+        sets, (Abc, aBc, ABc, abC, AbC, aBC, ABC) for three)
+    """
+    # Encode each gene's membership as a bit pattern and count each pattern
+    codes = sum(bitmap.astype(np.int64) << bit for bit, bitmap in enumerate(bitmaps))
+    return tuple(int(n) for n in np.bincount(codes, minlength=2 ** len(bitmaps))[1:])
+
+
+def plot_venn_diagrams(gene_bitmaps: Dict[str, np.ndarray], overlaps: Dict,
+                       tool_counts: Dict[str, int], output_path: str):
     """
     Create Venn diagrams showing overlaps between annotation tools.
     
     Args:
-        gene_sets: Dictionary mapping tool names to sets of annotated genes
+        gene_bitmaps: Dictionary mapping tool names to gene bitmaps
+        overlaps: Overlap statistics from calculate_overlaps
+        tool_counts: Dictionary mapping tool names to annotated gene counts
         output_path: Path to save the figure
     """
     # Create figure with multiple Venn diagrams
-    fig = plt.figure(figsize=(18, 6))
+    fig = plt.figure(figsize=(18, 6), layout='constrained')
+    # Set labels can sit above the circles, so leave room for the titles
+    fig.get_layout_engine().set(h_pad=0.25)
     
     # Venn diagram 1: KofamScan vs InterProScan vs EggNOG
-    if 'KofamScan' in gene_sets and 'InterProScan' in gene_sets and 'EggNOG (combined)' in gene_sets:
+    if 'KofamScan' in gene_bitmaps and 'InterProScan' in gene_bitmaps and 'EggNOG (combined)' in gene_bitmaps:
         ax1 = fig.add_subplot(1, 3, 1)
-        venn3([gene_sets['KofamScan'], gene_sets['InterProScan'], gene_sets['EggNOG (combined)']], 
+        venn3(subsets=venn_region_sizes([gene_bitmaps['KofamScan'], gene_bitmaps['InterProScan'],
+                                         gene_bitmaps['EggNOG (combined)']]),
               set_labels=('KofamScan', 'InterProScan', 'EggNOG'),
               ax=ax1)
         ax1.set_title('Tool Overlap: KofamScan, InterProScan & EggNOG', fontweight='bold', fontsize=12)
     
     # Venn diagram 2: KofamScan vs InterProScan (2-way)
-    if 'KofamScan' in gene_sets and 'InterProScan' in gene_sets:
+    if 'KofamScan' in gene_bitmaps and 'InterProScan' in gene_bitmaps:
         ax2 = fig.add_subplot(1, 3, 2)
-        venn2([gene_sets['KofamScan'], gene_sets['InterProScan']], 
+        venn2(subsets=venn_region_sizes([gene_bitmaps['KofamScan'], gene_bitmaps['InterProScan']]),
               set_labels=('KofamScan', 'InterProScan'),
               ax=ax2)
         ax2.set_title('Tool Overlap: KofamScan & InterProScan', fontweight='bold', fontsize=12)
     
     # Venn diagram 3: Traditional tools vs FANTASIA
-    if 'FANTASIA (post-filtering)' in gene_sets:
-        traditional_tools = set()
-        if 'KofamScan' in gene_sets:
-            traditional_tools.update(gene_sets['KofamScan'])
-        if 'InterProScan' in gene_sets:
-            traditional_tools.update(gene_sets['InterProScan'])
-        if 'EggNOG (combined)' in gene_sets:
-            traditional_tools.update(gene_sets['EggNOG (combined)'])
+    # (region sizes follow from the union and FANTASIA-unique counts)
+    traditional_count = overlaps['kofam_interpro_eggnog_combined'][1]
+    if 'FANTASIA (post-filtering)' in gene_bitmaps and traditional_count > 0:
+        fantasia_only = overlaps['fantasia_unique'][1]
+        shared = tool_counts['FANTASIA (post-filtering)'] - fantasia_only
         
-        if traditional_tools:
-            ax3 = fig.add_subplot(1, 3, 3)
-            venn2([traditional_tools, gene_sets['FANTASIA (post-filtering)']], 
-                  set_labels=('Traditional Tools', 'FANTASIA'),
-                  ax=ax3)
-            ax3.set_title('Traditional Tools vs FANTASIA', fontweight='bold', fontsize=12)
-    
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+        ax3 = fig.add_subplot(1, 3, 3)
+        venn2(subsets=(traditional_count - shared, fantasia_only, shared),
+              set_labels=('Traditional Tools', 'FANTASIA'),
+              ax=ax3)
+        ax3.set_title('Traditional Tools vs FANTASIA', fontweight='bold', fontsize=12)
+    
+    if not fig.axes:
+        # Larger overlaps are covered by the UpSet plot
+        print("⚠ Not enough tools for Venn diagrams (see the UpSet plot)")
+        plt.close(fig)
+        return
+    
+    fig.savefig(output_path, dpi=300, pil_kwargs={'compress_level': PNG_COMPRESS_LEVEL})
     print(f"✓ Saved Venn diagrams: {output_path}")
-    plt.close()
+    plt.close(fig)
 
 
-def plot_upset_diagram(gene_sets: Dict[str, Set[str]], total_genes_set: Set[str], output_path: str):
+def plot_upset_diagram(gene_bitmaps: Dict[str, np.ndarray], fasta_bitmap: np.ndarray,
+                       output_path: str):
     """
     Create UpSet plot showing comprehensive multi-tool overlaps.
     
     Args:
-        gene_sets: Dictionary mapping tool names to sets of annotated genes
-        total_genes_set: Set of all genes in the dataset
+        gene_bitmaps: Dictionary mapping tool names to gene bitmaps
+        fasta_bitmap: Bitmap of the genes present in the FASTA file
         output_path: Path to save the figure
     """
     # Prepare data for UpSet plot - only include main tools
     main_tools = {}
-    if 'KofamScan' in gene_sets:
-        main_tools['KofamScan'] = gene_sets['KofamScan']
-    if 'InterProScan' in gene_sets:
-        main_tools['InterProScan'] = gene_sets['InterProScan']
-    if 'EggNOG (combined)' in gene_sets:
-        main_tools['EggNOG'] = gene_sets['EggNOG (combined)']
-    if 'FANTASIA (post-filtering)' in gene_sets:
-        main_tools['FANTASIA'] = gene_sets['FANTASIA (post-filtering)']
+    if 'KofamScan' in gene_bitmaps:
+        main_tools['KofamScan'] = gene_bitmaps['KofamScan']
+    if 'InterProScan' in gene_bitmaps:
+        main_tools['InterProScan'] = gene_bitmaps['InterProScan']
+    if 'EggNOG (combined)' in gene_bitmaps:
+        main_tools['EggNOG'] = gene_bitmaps['EggNOG (combined)']
+    if 'FANTASIA (post-filtering)' in gene_bitmaps:
+        main_tools['FANTASIA'] = gene_bitmaps['FANTASIA (post-filtering)']
     
     if len(main_tools) < 2:
         print("⚠ Not enough tools for UpSet plot (need at least 2)")
         return
     
-    # Create membership dictionary for each gene
-    memberships = []
-    for gene in total_genes_set:
-        membership = tuple(tool for tool, genes in main_tools.items() if gene in genes)
-        if membership:  # Only include genes annotated by at least one tool
-            memberships.append(membership)
+    # Indicator matrix (FASTA genes x tools), keeping only genes annotated
+    # by at least one tool
+    indicators = pd.DataFrame({tool: bitmap[fasta_bitmap] for tool, bitmap in main_tools.items()})
+    indicators = indicators[indicators.any(axis=1)]
     
     # Create UpSet plot
-    if memberships:
-        upset_data = from_memberships(memberships)
+    if not indicators.empty:
+        upset_data = from_indicators(list(main_tools), data=indicators)
         
         fig = plt.figure(figsize=(14, 8))
         upset = UpSet(upset_data, 
@@ -552,71 +1080,71 @@ def plot_upset_diagram(gene_sets: Dict[str, Set[str]], total_genes_set: Set[str]
                      sort_by='cardinality',
                      element_size=40)
         upset.plot(fig=fig)
-        plt.suptitle('Multi-Tool Annotation Overlap (UpSet Plot)', 
-                    fontweight='bold', fontsize=14, y=0.98)
+        fig.suptitle('Multi-Tool Annotation Overlap (UpSet Plot)', 
+                     fontweight='bold', fontsize=14, y=0.98)
         
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
+        # UpSet lays out its own axes, so it keeps the tight bounding box
+        fig.savefig(output_path, dpi=300, bbox_inches='tight',
+                    pil_kwargs={'compress_level': PNG_COMPRESS_LEVEL})
         print(f"✓ Saved UpSet plot: {output_path}")
-        plt.close()
+        plt.close(fig)
     else:
         print("⚠ No overlapping annotations found for UpSet plot")
 
 
-def plot_annotation_heatmap(gene_sets: Dict[str, Set[str]], total_genes_set: Set[str], 
+def plot_annotation_heatmap(gene_bitmaps: Dict[str, np.ndarray], gene_names: np.ndarray,
                             output_path: str, max_genes: int = 100):
     """
     Create heatmap showing annotation density (which genes are annotated by which tools).
     
     Args:
-        gene_sets: Dictionary mapping tool names to sets of annotated genes
-        total_genes_set: Set of all genes in the dataset
+        gene_bitmaps: Dictionary mapping tool names to gene bitmaps
+        gene_names: Sorted gene index from build_gene_index
         output_path: Path to save the figure
         max_genes: Maximum number of genes to display (for readability)
     """
     # Select main tools for heatmap
     main_tools = {}
-    if 'KofamScan' in gene_sets:
-        main_tools['KofamScan'] = gene_sets['KofamScan']
-    if 'InterProScan' in gene_sets:
-        main_tools['InterProScan'] = gene_sets['InterProScan']
-    if 'EggNOG (combined)' in gene_sets:
-        main_tools['EggNOG'] = gene_sets['EggNOG (combined)']
-    if 'FANTASIA (post-filtering)' in gene_sets:
-        main_tools['FANTASIA'] = gene_sets['FANTASIA (post-filtering)']
+    if 'KofamScan' in gene_bitmaps:
+        main_tools['KofamScan'] = gene_bitmaps['KofamScan']
+    if 'InterProScan' in gene_bitmaps:
+        main_tools['InterProScan'] = gene_bitmaps['InterProScan']
+    if 'EggNOG (combined)' in gene_bitmaps:
+        main_tools['EggNOG'] = gene_bitmaps['EggNOG (combined)']
+    if 'FANTASIA (post-filtering)' in gene_bitmaps:
+        main_tools['FANTASIA'] = gene_bitmaps['FANTASIA (post-filtering)']
     
     if not main_tools:
         print("⚠ No tools available for heatmap")
         return
     
-    # Get genes that are annotated by at least one tool
-    annotated_genes = set()
-    for genes in main_tools.values():
-        annotated_genes.update(genes)
-    
-    # Sample genes if too many
-    genes_to_plot = sorted(list(annotated_genes))[:max_genes]
+    # First max_genes genes (in sorted ID order) annotated by at least one tool
+    annotated = np.logical_or.reduce(list(main_tools.values()))
+    gene_ids = np.flatnonzero(annotated)[:max_genes]
+    genes_to_plot = gene_names[gene_ids]
     
     # Create binary matrix: gene x tool
-    data = []
-    for gene in genes_to_plot:
-        row = [1 if gene in tool_genes else 0 for tool_genes in main_tools.values()]
-        data.append(row)
-    
-    # Create DataFrame
-    df_heatmap = pd.DataFrame(data, 
-                              index=genes_to_plot,
-                              columns=list(main_tools.keys()))
-    
-    # Plot heatmap
-    fig, ax = plt.subplots(figsize=(10, max(8, len(genes_to_plot) * 0.15)))
-    
-    sns.heatmap(df_heatmap, 
-                cmap=['#FFFFFF', '#2196F3'],
-                cbar_kws={'label': 'Annotated', 'ticks': [0, 1]},
-                linewidths=0.5,
-                linecolor='lightgray',
-                ax=ax,
-                yticklabels=True if len(genes_to_plot) <= 50 else False)
+    matrix = np.column_stack([bitmap[gene_ids] for bitmap in main_tools.values()]).astype(np.int8)
+    
+    # Plot heatmap as a single rasterized mesh rather than one vector patch per cell
+    fig, ax = plt.subplots(figsize=(10, max(8, len(genes_to_plot) * 0.15)), layout='constrained')
+    
+    im = ax.pcolormesh(matrix,
+                       cmap=ListedColormap(['#FFFFFF', '#2196F3']),
+                       vmin=0, vmax=1,
+                       edgecolors='lightgray',
+                       linewidth=0.5,
+                       rasterized=True)
+    fig.colorbar(im, ax=ax, ticks=[0, 1], label='Annotated')
+    
+    ax.set_xticks(np.arange(matrix.shape[1]) + 0.5)
+    ax.set_xticklabels(list(main_tools.keys()))
+    if len(genes_to_plot) <= 50:
+        ax.set_yticks(np.arange(matrix.shape[0]) + 0.5)
+        ax.set_yticklabels(genes_to_plot)
+    else:
+        ax.set_yticks([])
+    ax.invert_yaxis()  # First gene at the top
     
     ax.set_xlabel('Annotation Tool', fontweight='bold', fontsize=12)
     ax.set_ylabel('Genes', fontweight='bold', fontsize=12)
@@ -624,18 +1152,18 @@ def plot_annotation_heatmap(gene_sets: Dict[str, Set[str]], total_genes_set: Set
     title = f'Annotation Density Heatmap (First {len(genes_to_plot)} Annotated Genes)'
     ax.set_title(title, fontweight='bold', fontsize=14, pad=20)
     
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    fig.savefig(output_path, dpi=300, pil_kwargs={'compress_level': PNG_COMPRESS_LEVEL})
     print(f"✓ Saved annotation heatmap: {output_path}")
-    plt.close()
+    plt.close(fig)
 
 
-def plot_annotation_type_breakdown(annotations: Dict, output_path: str):
+def plot_annotation_type_breakdown(annotations: Dict, fantasia_post_count: int, output_path: str):
     """
     Create stacked bar chart showing GO vs KEGG annotation breakdown per tool.
     
     Args:
-        annotations: Dictionary of annotation statistics
+        annotations: Dictionary of annotated gene counts (as for create_annotation_summary)
+        fantasia_post_count: Number of genes annotated by any post-filtering FANTASIA model
         output_path: Path to save the figure
     """
     # Extract GO and KEGG counts per tool
@@ -644,32 +1172,28 @@ def plot_annotation_type_breakdown(annotations: Dict, output_path: str):
     # KofamScan - only KEGG
     if 'KofamScan' in annotations:
         tools_data['KofamScan'] = {
-            'KEGG': annotations['KofamScan'][1],
+            'KEGG': annotations['KofamScan'],
             'GO': 0
         }
     
     # InterProScan - has GO (approximate from total)
     if 'InterProScan' in annotations:
         tools_data['InterProScan'] = {
-            'GO': annotations['InterProScan'][1],
+            'GO': annotations['InterProScan'],
             'KEGG': 0
         }
     
     # EggNOG - has both
     if 'EggNOG' in annotations and isinstance(annotations['EggNOG'], dict):
         tools_data['EggNOG'] = {
-            'GO': annotations['EggNOG']['GO'][1],
-            'KEGG': annotations['EggNOG']['KEGG'][1]
+            'GO': annotations['EggNOG']['GO'],
+            'KEGG': annotations['EggNOG']['KEGG']
         }
     
     # FANTASIA - only GO (post-filtering if available)
-    fantasia_post_genes = set()
-    for key in annotations.keys():
-        if 'FANTASIA' in key and '(post)' in key:
-            fantasia_post_genes.update(annotations[key][0])
-    if fantasia_post_genes:
+    if fantasia_post_count > 0:
         tools_data['FANTASIA'] = {
-            'GO': len(fantasia_post_genes),
+            'GO': fantasia_post_count,
             'KEGG': 0
         }
     
@@ -683,7 +1207,7 @@ def plot_annotation_type_breakdown(annotations: Dict, output_path: str):
     kegg_counts = [tools_data[tool]['KEGG'] for tool in tools]
     
     # Create stacked bar chart
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = plt.subplots(figsize=(10, 6), layout='constrained')
     
     x = np.arange(len(tools))
     width = 0.6
@@ -710,10 +1234,34 @@ def plot_annotation_type_breakdown(annotations: Dict, output_path: str):
                    ha='center', va='center', fontweight='bold', color='white')
         ax.text(i, total, f'{total}', ha='center', va='bottom', fontweight='bold')
     
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    fig.savefig(output_path, dpi=300, pil_kwargs={'compress_level': PNG_COMPRESS_LEVEL})
     print(f"✓ Saved annotation type breakdown: {output_path}")
-    plt.close()
+    plt.close(fig)
+
+
+def _run_plot(plot_fn, *args) -> Tuple[str, Optional[str]]:
+    """
+    Draw one figure, capturing what the plot function prints.
+    
+    The output is returned rather than printed so plots drawn in worker
+    processes are still reported in a fixed order.
+    
+    Args:
+        plot_fn: One of the plot_* functions
+        *args: Arguments for plot_fn
+        
+    Returns:
+        Tuple of (printed output, error message or None)
+    """
+    output = io.StringIO()
+    error = None
+    with contextlib.redirect_stdout(output):
+        try:
+            plot_fn(*args)
+        except Exception as e:
+            plt.close('all')  # Drop the partly drawn figure
+            error = str(e)
+    return output.getvalue(), error
 
 
 def main():
@@ -749,6 +1297,36 @@ Examples:
         help='Sample name prefix for file matching (e.g., "mysample" for mysample_kofamscan_per_gene.xlsx)'
     )
     
+    parser.add_argument(
+        '--cache',
+        action='store_true',
+        help='Cache parsed Excel sheets as Parquet and reuse them while the Excel files are unchanged (requires pyarrow)'
+    )
+    
+    parser.add_argument(
+        '--cache-dir',
+        help='Directory for the Parquet cache, e.g. when --excel-dir is read-only (default: .cache/ inside --excel-dir)'
+    )
+    
+    parser.add_argument(
+        '--legacy-pies',
+        action='store_true',
+        help='Draw one pie chart per tool instead of stacked bars in the annotation overview'
+    )
+    
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='Number of processes used to parse the Excel files and draw the plots; 1 runs everything in one process (default: 1)'
+    )
+    
+    parser.add_argument(
+        '--quiet',
+        action='store_true',
+        help='Do not print the annotation summary table (it is still saved as CSV)'
+    )
+    
     parser.add_argument(
         '--output-dir',
         default='.',
@@ -757,6 +1335,10 @@ Examples:
     
     args = parser.parse_args()
     
+    global USE_CACHE, CACHE_DIR
+    USE_CACHE = args.cache
+    CACHE_DIR = os.path.abspath(args.cache_dir) if args.cache_dir else None
+    
     # Validate inputs
     if not os.path.exists(args.fasta):
         print(f"Error: FASTA file not found: {args.fasta}")
@@ -766,6 +1348,16 @@ Examples:
         print(f"Error: Excel directory not found: {args.excel_dir}")
         sys.exit(1)
     
+    if EXCEL_ENGINE == 'openpyxl':
+        print("Note: python-calamine is not installed; reading Excel files with the slower openpyxl")
+    
+    if args.jobs < 1:
+        print("Error: --jobs must be at least 1")
+        sys.exit(1)
+    
+    # Index the Excel directory once instead of probing each file separately
+    excel_files = {entry.name for entry in os.scandir(args.excel_dir) if entry.is_file()}
+    
     # Create output directory
     os.makedirs(args.output_dir, exist_ok=True)
     
@@ -793,50 +1385,66 @@ Examples:
     annotations = {}
     gene_sets = {}
     
-    # KofamScan
-    kofam_file = os.path.join(args.excel_dir, f"{args.sample}_kofamscan_per_gene.xlsx")
-    if os.path.exists(kofam_file):
-        genes, count = count_annotated_genes_kofamscan(kofam_file)
-        annotations['KofamScan'] = (genes, count)
-        gene_sets['KofamScan'] = genes
-        print(f"✓ KofamScan: {count} genes with KEGG annotations")
-    else:
-        print(f"⚠ KofamScan file not found: {kofam_file}")
-    
-    # InterProScan
-    interpro_file = os.path.join(args.excel_dir, f"{args.sample}_interproscan_per_gene.xlsx")
-    if os.path.exists(interpro_file):
-        genes, count = count_annotated_genes_interproscan(interpro_file)
-        annotations['InterProScan'] = (genes, count)
-        gene_sets['InterProScan'] = genes
-        print(f"✓ InterProScan: {count} genes with GO/Pathway annotations")
-    else:
-        print(f"⚠ InterProScan file not found: {interpro_file}")
+    kofam_name = f"{args.sample}_kofamscan_per_gene.xlsx"
+    kofam_file = os.path.join(args.excel_dir, kofam_name)
+    interpro_name = f"{args.sample}_interproscan_per_gene.xlsx"
+    interpro_file = os.path.join(args.excel_dir, interpro_name)
     
     # EggNOG (check for v5 or v7)
     eggnog_file = None
     for version in ['v5', 'v7']:
-        test_file = os.path.join(args.excel_dir, f"{args.sample}_eggnog_{version}_per_gene.xlsx")
-        if os.path.exists(test_file):
-            eggnog_file = test_file
+        test_name = f"{args.sample}_eggnog_{version}_per_gene.xlsx"
+        if test_name in excel_files:
+            eggnog_file = os.path.join(args.excel_dir, test_name)
             break
     
-    if eggnog_file:
-        eggnog_data = count_annotated_genes_eggnog(eggnog_file)
-        annotations['EggNOG'] = eggnog_data
-        print(f"✓ EggNOG (GO): {eggnog_data['GO'][1]} genes with GO annotations")
-        print(f"✓ EggNOG (KEGG): {eggnog_data['KEGG'][1]} genes with KEGG annotations")
-        # Combined EggNOG genes (with either GO or KEGG)
-        eggnog_combined = eggnog_data['GO'][0] | eggnog_data['KEGG'][0]
-        gene_sets['EggNOG (combined)'] = eggnog_combined
-    else:
-        print(f"⚠ EggNOG file not found")
-    
-    # FANTASIA - analyze all models
-    print("\n" + "-"*60)
-    print("FANTASIA Analysis (Pre- and Post-Filtering)")
-    print("-"*60)
-    fantasia_results = analyze_fantasia_models(args.excel_dir, args.sample)
+    # Each Excel file is parsed independently, so queue all of them (tools
+    # and FANTASIA models) on one process pool and report them in order;
+    # no more workers than there are files to parse
+    n_inputs = sum(1 for name in excel_files
+                   if name.startswith(f"{args.sample}_") and '_per_gene' in name and name.endswith('.xlsx'))
+    with worker_pool(min(args.jobs, n_inputs)) as executor:
+        kofam_future = (submit_load(executor, 'kofamscan', kofam_file)
+                        if kofam_name in excel_files else None)
+        interpro_future = (submit_load(executor, 'interproscan', interpro_file)
+                           if interpro_name in excel_files else None)
+        eggnog_future = (submit_load(executor, 'eggnog', eggnog_file)
+                         if eggnog_file else None)
+        
+        # KofamScan
+        if kofam_future is not None:
+            genes, count = kofam_future.result()
+            annotations['KofamScan'] = (genes, count)
+            gene_sets['KofamScan'] = genes
+            print(f"✓ KofamScan: {count} genes with KEGG annotations")
+        else:
+            print(f"⚠ KofamScan file not found: {kofam_file}")
+        
+        # InterProScan
+        if interpro_future is not None:
+            genes, count = interpro_future.result()
+            annotations['InterProScan'] = (genes, count)
+            gene_sets['InterProScan'] = genes
+            print(f"✓ InterProScan: {count} genes with GO/Pathway annotations")
+        else:
+            print(f"⚠ InterProScan file not found: {interpro_file}")
+        
+        # EggNOG
+        if eggnog_future is not None:
+            eggnog_data = eggnog_future.result()
+            # Combined EggNOG genes (with either GO or KEGG)
+            gene_sets['EggNOG (combined)'] = eggnog_data.pop('combined')[0]
+            annotations['EggNOG'] = eggnog_data
+            print(f"✓ EggNOG (GO): {eggnog_data['GO'][1]} genes with GO annotations")
+            print(f"✓ EggNOG (KEGG): {eggnog_data['KEGG'][1]} genes with KEGG annotations")
+        else:
+            print(f"⚠ EggNOG file not found")
+        
+        # FANTASIA - analyze all models
+        print("\n" + "-"*60)
+        print("FANTASIA Analysis (Pre- and Post-Filtering)")
+        print("-"*60)
+        fantasia_results = analyze_fantasia_models(args.excel_dir, args.sample, executor)
     
     # Pre-filtering
     print("\nPre-filtering:")
@@ -846,81 +1454,94 @@ Examples:
     
     # Post-filtering
     print("\nPost-filtering:")
-    fantasia_post_combined = set()
+    fantasia_post_sets = []
     for model, (genes, count) in fantasia_results['post_filtering'].items():
         annotations[f'FANTASIA {model} (post)'] = (genes, count)
-        fantasia_post_combined.update(genes)
+        fantasia_post_sets.append(genes)
         print(f"  {model}: {count} genes")
     
-    # Use consensus or combined post-filtering for overlap analysis
-    gene_sets['FANTASIA (post-filtering)'] = fantasia_post_combined
+    # Map gene IDs to integers once and mark each tool's genes in a single
+    # gene x tool matrix; overlaps and the Venn, UpSet and heatmap plots work
+    # on its columns. FANTASIA uses the union of the post-filtering models.
+    gene_names = build_gene_index(total_genes_set, [*gene_sets.values(), *fantasia_post_sets])
+    tool_gene_sets = {tool: [genes] for tool, genes in gene_sets.items()}
+    tool_gene_sets['FANTASIA (post-filtering)'] = fantasia_post_sets
+    annotation_matrix, gene_bitmaps = build_annotation_matrix(tool_gene_sets, gene_names)
+    fasta_bitmap = genes_to_bitmap(total_genes_set, gene_names)
+    
+    # Annotated genes per tool, counted once for all plots
+    tool_counts = dict(zip(gene_bitmaps, np.count_nonzero(annotation_matrix, axis=0).tolist()))
+    
+    # Everything downstream works on the matrix or on counts, so keep only the
+    # counts and let the per-tool gene ID sets be freed
+    annotations = {tool: ({subtype: count for subtype, (_, count) in data.items()}
+                          if isinstance(data, dict) else data[1])
+                   for tool, data in annotations.items()}
+    del gene_sets, tool_gene_sets, fantasia_results, fantasia_post_sets, total_genes_set
+    
+    # Overlaps are reported in Step 5 but also feed the Venn diagrams
+    overlaps = calculate_overlaps(annotation_matrix, gene_bitmaps)
     
     # Step 3: Create summary statistics
     print("\n" + "="*60)
     print("Step 3: Creating Summary Statistics")
     print("="*60)
     summary_df = create_annotation_summary(total_genes, annotations)
+    summary_table = format_annotation_summary(summary_df)
     
     # Save summary to CSV
     summary_csv = os.path.join(args.output_dir, f"{args.sample}_annotation_summary.csv")
     try:
-        summary_df.to_csv(summary_csv, index=False)
+        summary_table.to_csv(summary_csv, index=False)
         print(f"✓ Saved summary: {summary_csv}")
     except (IOError, OSError) as e:
         print(f"Error: Failed to save summary CSV: {e}")
         sys.exit(1)
     
-    # Display summary
-    print("\nAnnotation Summary:")
-    print(summary_df.to_string(index=False))
+    # Display summary (the CSV holds the same table)
+    if not args.quiet:
+        print("\nAnnotation Summary:")
+        print(summary_table.to_string(index=False))
     
     # Step 4: Create visualizations
     print("\n" + "="*60)
     print("Step 4: Creating Visualizations")
     print("="*60)
     
-    # Pie charts
-    pie_chart_path = os.path.join(args.output_dir, f"{args.sample}_annotation_pie_charts.png")
-    plot_annotation_pie_charts(summary_df, pie_chart_path)
-    
-    # Comparison bar chart
-    comparison_path = os.path.join(args.output_dir, f"{args.sample}_annotation_comparison.png")
-    plot_combined_comparison(summary_df, comparison_path)
-    
-    # Venn diagrams
+    overview_path = os.path.join(args.output_dir, f"{args.sample}_annotation_overview.png")
     venn_path = os.path.join(args.output_dir, f"{args.sample}_venn_diagrams.png")
-    try:
-        plot_venn_diagrams(gene_sets, venn_path)
-    except Exception as e:
-        print(f"⚠ Could not create Venn diagrams: {e}")
-    
-    # UpSet plot
     upset_path = os.path.join(args.output_dir, f"{args.sample}_upset_plot.png")
-    try:
-        plot_upset_diagram(gene_sets, total_genes_set, upset_path)
-    except Exception as e:
-        print(f"⚠ Could not create UpSet plot: {e}")
-    
-    # Annotation heatmap
     heatmap_path = os.path.join(args.output_dir, f"{args.sample}_annotation_heatmap.png")
-    try:
-        plot_annotation_heatmap(gene_sets, total_genes_set, heatmap_path)
-    except Exception as e:
-        print(f"⚠ Could not create annotation heatmap: {e}")
-    
-    # Annotation type breakdown (GO vs KEGG)
     breakdown_path = os.path.join(args.output_dir, f"{args.sample}_annotation_type_breakdown.png")
-    try:
-        plot_annotation_type_breakdown(annotations, breakdown_path)
-    except Exception as e:
-        print(f"⚠ Could not create annotation type breakdown: {e}")
+    
+    plots = [
+        # Annotation coverage and tool comparison
+        ('annotation overview', plot_annotation_overview,
+         (summary_df, overview_path, args.legacy_pies)),
+        ('Venn diagrams', plot_venn_diagrams,
+         (gene_bitmaps, overlaps, tool_counts, venn_path)),
+        ('UpSet plot', plot_upset_diagram, (gene_bitmaps, fasta_bitmap, upset_path)),
+        ('annotation heatmap', plot_annotation_heatmap,
+         (gene_bitmaps, gene_names, heatmap_path)),
+        # Annotation type breakdown (GO vs KEGG)
+        ('annotation type breakdown', plot_annotation_type_breakdown,
+         (annotations, tool_counts['FANTASIA (post-filtering)'], breakdown_path)),
+    ]
+    
+    # The figures share no state, so draw them in parallel worker processes
+    with worker_pool(min(args.jobs, len(plots))) as executor:
+        futures = [submit_task(executor, _run_plot, plot_fn, *plot_args)
+                   for _, plot_fn, plot_args in plots]
+        for (name, _, _), future in zip(plots, futures):
+            output, error = future.result()
+            print(output, end='')
+            if error is not None:
+                print(f"⚠ Could not create {name}: {error}")
     
     # Step 5: Calculate overlaps
     print("\n" + "="*60)
     print("Step 5: Calculating Tool Overlaps")
     print("="*60)
-    overlaps = calculate_overlaps(gene_sets)
-    
     print(f"All tools combined: {overlaps['all_tools_combined'][1]} genes")
     print(f"Genes annotated by ALL tools: {overlaps['annotated_by_all'][1]} genes")
     print(f"\nKofamScan + InterProScan + EggNOG:")
@@ -930,15 +1551,14 @@ Examples:
     
     # Save overlap summary
     overlap_summary_path = os.path.join(args.output_dir, f"{args.sample}_overlap_summary.txt")
-    create_venn_style_summary(overlaps, overlap_summary_path)
+    create_venn_style_summary(overlaps, gene_names, overlap_summary_path)
     
     print("\n" + "="*60)
     print("Analysis Complete!")
     print("="*60)
     print(f"\nOutput files saved to: {args.output_dir}")
     print(f"  - {args.sample}_annotation_summary.csv")
-    print(f"  - {args.sample}_annotation_pie_charts.png")
-    print(f"  - {args.sample}_annotation_comparison.png")
+    print(f"  - {args.sample}_annotation_overview.png")
     print(f"  - {args.sample}_venn_diagrams.png")
     print(f"  - {args.sample}_upset_plot.png")
     print(f"  - {args.sample}_annotation_heatmap.png")
@@ -52,7 +52,6 @@ echo
 echo "================================================"
 echo "Complete! Check ${OUTPUT_DIR} for results:"
 echo "  - ${SAMPLE_NAME}_annotation_summary.csv"
-echo "  - ${SAMPLE_NAME}_annotation_pie_charts.png"
-echo "  - ${SAMPLE_NAME}_annotation_comparison.png"
+echo "  - ${SAMPLE_NAME}_annotation_overview.png"
 echo "  - ${SAMPLE_NAME}_overlap_summary.txt"
 echo "================================================"
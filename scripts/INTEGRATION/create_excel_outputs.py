@@ -47,72 +47,438 @@ Repository: aaronkiggen/Functional_Annotation_Pipeline
 """
 
 import argparse
+import contextlib
+import csv
+import functools
 import gzip
+import hashlib
+import io
 import os
 import sys
+from concurrent.futures import Future, ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 
 try:
     import pandas as pd
     from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
     from openpyxl.styles import Font, PatternFill, Alignment
+    from openpyxl.utils import get_column_letter
+    from openpyxl.worksheet.dimensions import ColumnDimension
 except ImportError:
     print("Error: Required packages not found.")
     print("Please install: pip install pandas openpyxl")
     sys.exit(1)
 
+# xlsxwriter streams rows straight to XML and is the fastest writer; when it
+# is not installed, fall back to openpyxl's write-only (streaming) workbook.
+try:
+    import xlsxwriter
+    XLSX_ENGINE = 'xlsxwriter'
+except ImportError:
+    XLSX_ENGINE = 'openpyxl'
+
+# openpyxl serialises worksheets with lxml when it is installed, which is
+# considerably faster than its pure-Python fallback
+from openpyxl.xml import LXML as OPENPYXL_LXML
+
+# pyarrow's CSV reader inflates and parses gzipped tables in C threads; it is
+# used for gzipped inputs when available, pandas' reader otherwise.
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa_csv = None
+
+# Parsed columns are all short strings: store them in pyarrow arrays rather
+# than as Python objects when pyarrow is installed
+STRING_DTYPE = pd.StringDtype('pyarrow') if pa_csv is not None else str
+
+# Parsed tables are cached as Parquet (opt-in with --cache) in a directory
+# with this name next to each input file, unless CACHE_DIR is set
+CACHE_DIR_NAME = '.cache'
+CACHE_DIR = None
+
+# Bump when parser output changes so existing cache entries are ignored
+CACHE_VERSION = 1
+
+# Set from --cache in main(), and in worker processes by _init_worker()
+USE_CACHE = False
+
+# Header style shared by every output sheet; the openpyxl style objects are
+# immutable, so a single instance is reused for every header cell
+HEADER_COLOR = '366092'
+HEADER_FILL = PatternFill(start_color=HEADER_COLOR, end_color=HEADER_COLOR, fill_type="solid")
+HEADER_FONT = Font(bold=True, color="FFFFFF")
+HEADER_ALIGNMENT = Alignment(horizontal='center')
+XLSXWRITER_HEADER_FORMAT = {
+    'bold': True, 'font_color': '#FFFFFF', 'bg_color': f'#{HEADER_COLOR}',
+    'pattern': 1, 'align': 'center',
+}
+
+# Set from --max-excel-rows in main(), and in worker processes by
+# _init_worker(); larger tables are written in full to a Parquet file next to
+# the workbook, which only keeps the first MAX_EXCEL_ROWS rows
+MAX_EXCEL_ROWS = None
+
+# Leading bytes of a gzip stream; compressed inputs are recognised by these
+# rather than by their file extension
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+def _width_runs(col_widths: List[float]) -> List[Tuple[int, int, float]]:
+    """Group column widths into (first, last, width) runs of adjacent columns
+    with the same width; column indices are 0-based and inclusive."""
+    runs = []
+    for i, width in enumerate(col_widths):
+        if runs and runs[-1][2] == width and runs[-1][1] == i - 1:
+            runs[-1] = (runs[-1][0], i, width)
+        else:
+            runs.append((i, i, width))
+    return runs
+
+
+@contextlib.contextmanager
+def _atomic_output(output_file: str):
+    """Yield a temporary path next to output_file, which replaces output_file
+    when the block completes and is removed if it raises."""
+    root, ext = os.path.splitext(output_file)
+    tmp_file = f"{root}.tmp{ext}"
+    try:
+        yield tmp_file
+        os.replace(tmp_file, output_file)
+    finally:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+
+def _write_xlsx(df: pd.DataFrame, output_file: str, col_widths: List[float],
+                sheet_name: str = 'Annotations'):
+    """Write a DataFrame to a single-sheet Excel file with a styled header.
+
+    Args:
+        df: DataFrame to write (index is not written).
+        output_file: Path of the .xlsx file to create.
+        col_widths: Column widths, in column order.
+        sheet_name: Name of the worksheet.
+    """
+    parquet_file = os.path.splitext(output_file)[0] + '.parquet'
+    if MAX_EXCEL_ROWS is not None and len(df) > MAX_EXCEL_ROWS:
+        df.to_parquet(parquet_file, index=False, compression='zstd')
+        print(f"  {len(df)} rows exceed --max-excel-rows; full table written to {parquet_file}")
+        df = df.head(MAX_EXCEL_ROWS)
+    elif os.path.exists(parquet_file):
+        # Left by an earlier run; the workbook now holds the whole table
+        os.remove(parquet_file)
+    
+    # Write under a temporary name and move it into place once complete, so
+    # an interrupted run never leaves a truncated workbook behind
+    with _atomic_output(output_file) as tmp_file:
+        _write_xlsx_file(df, tmp_file, col_widths, sheet_name)
+
+
+def _write_xlsx_file(df: pd.DataFrame, output_file: str, col_widths: List[float],
+                     sheet_name: str):
+    """Write the sheet with the fastest available writer (see _write_xlsx)"""
+    # Missing values become empty cells, as with DataFrame.to_excel
+    values = df.astype(object).where(df.notna(), None)
+    
+    if XLSX_ENGINE == 'xlsxwriter':
+        # constant_memory flushes each row to disk once the next one starts,
+        # so rows are written strictly in order. Strings are kept as text
+        # rather than checked for URLs, as openpyxl does.
+        workbook = xlsxwriter.Workbook(output_file, {'constant_memory': True,
+                                                     'strings_to_urls': False})
+        worksheet = workbook.add_worksheet(sheet_name)
+        for first, last, width in _width_runs(col_widths):
+            worksheet.set_column(first, last, width)
+        header_fmt = workbook.add_format(XLSXWRITER_HEADER_FORMAT)
+        worksheet.write_row(0, 0, [str(c) for c in df.columns], header_fmt)
+        for row_idx, row in enumerate(values.itertuples(index=False, name=None), start=1):
+            worksheet.write_row(row_idx, 0, row)
+        workbook.close()
+        return
+
+    # openpyxl write-only mode: rows are serialised as they are appended
+    # instead of being kept as Cell objects until save.
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(sheet_name)
+    for first, last, width in _width_runs(col_widths):
+        letter = get_column_letter(first + 1)
+        worksheet.column_dimensions[letter] = ColumnDimension(
+            worksheet, index=letter, min=first + 1, max=last + 1, width=width)
+
+    header = []
+    for col in df.columns:
+        cell = WriteOnlyCell(worksheet, value=str(col))
+        cell.fill = HEADER_FILL
+        cell.font = HEADER_FONT
+        cell.alignment = HEADER_ALIGNMENT
+        header.append(cell)
+    worksheet.append(header)
+    for row in values.itertuples(index=False, name=None):
+        worksheet.append(row)
+    workbook.save(output_file)
+
+
+def _is_gzipped(path: str) -> bool:
+    """Whether a file is gzip-compressed, judged by its magic bytes rather
+    than its extension."""
+    with open(path, 'rb') as f:
+        return f.read(2) == GZIP_MAGIC
+
+
+def _open_text(path: str):
+    """Open a plain or gzipped file for reading text."""
+    if _is_gzipped(path):
+        return gzip.open(path, 'rt')
+    return open(path, 'r')
+
+
+def _read_tsv(path: str, names: List, usecols: List, skiprows: int = 0) -> pd.DataFrame:
+    """Read selected columns of a headerless TSV file as strings.
+    
+    Plain files are read with pandas' C parser; gzipped files with pyarrow
+    when it is installed. Rows whose first field is empty or starts with '#'
+    (comments) are dropped.
+    
+    Args:
+        path: TSV file, optionally gzipped.
+        names: Names for the columns of the first row (later rows may be
+            shorter or longer).
+        usecols: Names of the columns to keep.
+        skiprows: Number of leading lines to skip.
+    
+    Returns:
+        DataFrame with the ``usecols`` columns, in ``names`` order.
+    """
+    gzipped = _is_gzipped(path)
+    if gzipped and pa_csv is not None:
+        df = _read_tsv_arrow(path, names, usecols, skiprows)
+    else:
+        df = _read_tsv_pandas(path, names, usecols, skiprows,
+                              'gzip' if gzipped else None)
+    # Lines used to be stripped before splitting: trim the first field and,
+    # when it is read, the last one
+    last = str(names[-1]) if gzipped and pa_csv is not None else names[-1]
+    if last in df.columns:
+        df[last] = df[last].str.rstrip()
+    first = df[df.columns[0]].str.strip()
+    keep = (first != '') & ~first.str.startswith('#')
+    df[df.columns[0]] = first
+    return df[keep].reset_index(drop=True)
+
+
+def _read_tsv_arrow(path: str, names: List, usecols: List, skiprows: int) -> pd.DataFrame:
+    """Read a gzipped TSV with pyarrow; rows of a different width are skipped."""
+    names = [str(c) for c in names]
+    usecols = [str(c) for c in usecols]
+    table = pa_csv.read_csv(
+        pa.input_stream(path, compression='gzip'),
+        read_options=pa_csv.ReadOptions(column_names=names, skip_rows=skiprows),
+        parse_options=pa_csv.ParseOptions(delimiter='\t', quote_char=False,
+                                          invalid_row_handler=lambda row: 'skip'),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=usecols,
+            column_types={c: pa.string() for c in usecols},
+            strings_can_be_null=False,
+        ),
+    )
+    return table.to_pandas(types_mapper={pa.string(): STRING_DTYPE}.get)
+
+
+def _read_tsv_pandas(path: str, names: List, usecols: List, skiprows: int,
+                     compression: Optional[str]) -> pd.DataFrame:
+    """Read a TSV with pandas' C parser; short rows are padded with '' and
+    fields beyond ``names`` are ignored."""
+    options = dict(sep='\t', header=None, skiprows=skiprows,
+                   dtype=STRING_DTYPE, na_filter=False, quoting=csv.QUOTE_NONE,
+                   compression=compression, engine='c')
+    try:
+        df = pd.read_csv(path, names=names, usecols=usecols, **options)
+    except (pd.errors.ParserError, ValueError):
+        # Every row is narrower than ``names``, or the first row is wider.
+        # Name every field of the widest line and read without usecols, so
+        # missing trailing fields are padded and extra ones dropped below.
+        with _open_text(path) as f:
+            width = max((line.count('\t') + 1 for line in f), default=0)
+        names = list(names) + list(range(len(names), width))
+        df = pd.read_csv(path, names=names, **options)[usecols]
+    return df
+
+
+def _locate_header(path: str, prefix: str = None) -> Tuple[int, List[str]]:
+    """Find the header line of a TSV file.
+    
+    Args:
+        path: TSV file, optionally gzipped.
+        prefix: If given, the header is the leading comment line starting with
+            it (e.g. '#query' for eggNOG-mapper); otherwise it is the first
+            line that is not a '#' comment.
+    
+    Returns:
+        Tuple of (line index, header fields), or (-1, []) if there is none.
+    """
+    with _open_text(path) as f:
+        for i, line in enumerate(f):
+            if prefix is not None:
+                if line.startswith(prefix):
+                    return i, line.rstrip('\r\n').lstrip('#').split('\t')
+                if not line.startswith('#'):
+                    break
+            elif not line.startswith('#'):
+                return i, line.rstrip('\r\n').split('\t')
+    return -1, []
+
+
+def _coalesce(df: pd.DataFrame, *columns: str) -> pd.Series:
+    """Per row, the first non-empty value among ``columns`` (absent ones are skipped)."""
+    result = pd.Series('', index=df.index, dtype=object)
+    for col in reversed(columns):
+        if col in df:
+            result = df[col].where(df[col] != '', result)
+    return result
+
+
+def _blank_dashes(series: pd.Series) -> pd.Series:
+    """Replace the '-' placeholder used for missing values with ''."""
+    return series.mask(series == '-', '')
+
+
+def _split_terms(values: pd.Series, sep: str) -> pd.Series:
+    """Split delimited cells into one stripped, non-empty item per row.
+    
+    The result keeps the index of the source row, repeated once per item.
+    """
+    items = values.str.split(sep).explode().str.strip()
+    return items[items.notna() & (items != '')]
+
+
+def _stack_terms(genes: pd.Series, frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Stack per-term frames into gene / term_type / ... rows.
+    
+    Args:
+        genes: Gene name of every source row.
+        frames: term_type -> frame of term columns indexed by source row
+            (as returned by _split_terms).
+    
+    Returns:
+        One row per term, ordered by source row and then by ``frames`` order.
+    """
+    stacked = pd.concat([frame.assign(term_type=term_type) for term_type, frame in frames.items()])
+    stacked = stacked.sort_index(kind='stable')
+    stacked['term_type'] = stacked['term_type'].astype('category')
+    stacked.insert(0, 'gene', genes.loc[stacked.index].to_numpy())
+    columns = ['gene', 'term_type'] + [c for c in stacked.columns if c not in ('gene', 'term_type')]
+    return stacked[columns].reset_index(drop=True)
+
 
 class AnnotationParser:
     """Base class for parsing annotation files"""
     
     # Constants
     KEGG_PREFIX = 'ko:'
-    KEGG_PREFIX_LEN = len(KEGG_PREFIX)
+    
+    # Output columns, in order
+    COLUMNS = ['gene_name', 'functional_term', 'extra_information']
+    
+    # Excel column widths, aligned with COLUMNS
+    COL_WIDTHS = [25, 20, 60]
+    
+    # Columns whose values repeat across many rows; stored as categoricals so
+    # each distinct string is held once
+    CATEGORY_COLUMNS = ['gene_name']
     
     def __init__(self, input_file: str):
         self.input_file = input_file
-        self.results = []
+        self.input_stat = None
+        self.df = pd.DataFrame(columns=self.COLUMNS)
     
     def parse(self):
-        """Parse the input file - to be implemented by subclasses"""
+        """Parse the input file into ``self.df``, going through the Parquet cache if enabled"""
+        # One stat both checks that the input exists and keys the caches
+        try:
+            self.input_stat = os.stat(self.input_file)
+        except FileNotFoundError:
+            print(f"Warning: File not found: {self.input_file}")
+            return
+        
+        cache_path = None
+        if USE_CACHE:
+            cache_path = self._cache_path()
+            try:
+                self.df = pd.read_parquet(cache_path)
+                return
+            except Exception:
+                pass  # Missing or unreadable entry: parse and (over)write it
+        
+        self._parse()
+        for col in self.CATEGORY_COLUMNS:
+            self.df[col] = self.df[col].astype('category')
+        
+        if cache_path is not None:
+            self._write_cache(cache_path)
+    
+    def _parse(self):
+        """Parse the input file into ``self.df`` - to be implemented by subclasses"""
         raise NotImplementedError
     
+    def _cache_key(self) -> str:
+        """Prefix of this parser's cache entries for the input file"""
+        name = os.path.basename(self.input_file)
+        if CACHE_DIR:
+            # A shared --cache-dir can hold inputs with the same name from
+            # different directories; keep their entries apart
+            path = os.path.abspath(self.input_file).encode()
+            name += '.' + hashlib.sha1(path).hexdigest()[:16]
+        return f"{name}.{type(self).__name__}"
+    
+    def _cache_path(self) -> str:
+        """
+        Build the Parquet cache path for the input file.
+        
+        The name encodes the file's modification time and size (plus
+        CACHE_VERSION), so an updated input never matches a stale entry.
+        """
+        stat = self.input_stat
+        cache_dir = CACHE_DIR or os.path.join(os.path.dirname(self.input_file), CACHE_DIR_NAME)
+        cache_name = (f"{self._cache_key()}.{stat.st_mtime_ns}.{stat.st_size}"
+                      f".v{CACHE_VERSION}.parquet")
+        return os.path.join(cache_dir, cache_name)
+    
+    def _write_cache(self, cache_path: str):
+        """
+        Write the parsed table to the cache, replacing stale entries.
+        
+        Caching is best-effort: if pyarrow is not installed or the directory
+        is not writable, the input is simply parsed again on the next run.
+        """
+        try:
+            cache_dir = os.path.dirname(cache_path)
+            os.makedirs(cache_dir, exist_ok=True)
+            prefix = self._cache_key() + '.'
+            for entry in os.scandir(cache_dir):
+                if entry.name.startswith(prefix) and entry.path != cache_path:
+                    os.remove(entry.path)
+            self.df.to_parquet(cache_path, index=False, compression='zstd')
+        except Exception:
+            pass
+    
     def to_dataframe(self) -> pd.DataFrame:
-        """Convert results to pandas DataFrame"""
-        if not self.results:
-            return pd.DataFrame(columns=['gene_name', 'functional_term', 'extra_information'])
-        return pd.DataFrame(self.results)
+        """Return the parsed results as a pandas DataFrame"""
+        return self.df
     
     def save_to_excel(self, output_file: str):
-        """Save results to Excel file with formatting"""
+        """Save results to Excel file, with the header styling shared by all
+        tools and the column widths in COL_WIDTHS"""
         df = self.to_dataframe()
         
         if df.empty:
             print(f"Warning: No data to write for {output_file}")
             return
         
-        # Create Excel writer
-        with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='Annotations')
-            
-            # Get workbook and worksheet
-            workbook = writer.book
-            worksheet = writer.sheets['Annotations']
-            
-            # Format header
-            header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            header_font = Font(bold=True, color="FFFFFF")
-            
-            for cell in worksheet[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal='center')
-            
-            # Adjust column widths
-            worksheet.column_dimensions['A'].width = 25  # gene_name
-            worksheet.column_dimensions['B'].width = 20  # functional_term
-            worksheet.column_dimensions['C'].width = 60  # extra_information
+        _write_xlsx(df, output_file, self.COL_WIDTHS)
         
         print(f"✓ Created: {output_file} ({len(df)} rows)")
 
@@ -120,202 +486,81 @@ class AnnotationParser:
 class KofamScanParser(AnnotationParser):
     """Parser for KofamScan output files"""
     
-    def parse(self):
+    COLUMNS = ['gene_name', 'KEGG']
+    COL_WIDTHS = [25, 20]
+    
+    def _parse(self):
         """
         Parse KofamScan pre-script output format:
         gene_name
         gene_name    KEGG_term
         """
-        self.results = []
-        
-        if not os.path.exists(self.input_file):
-            print(f"Warning: File not found: {self.input_file}")
-            return
-        
-        with open(self.input_file, 'r') as f:
-            for line in f:
-                # Skip comments and empty lines
-                if line.startswith('#') or not line.strip():
-                    continue
-                
-                parts = line.strip().split('\t')
-                gene_name = parts[0] if len(parts) >= 1 else ""
-                
-                # Gene may or may not have a KEGG term
-                if len(parts) >= 2:
-                    kegg_term = parts[1]
-                    self.results.append({
-                        'gene_name': gene_name,
-                        'KEGG': kegg_term
-                    })
-                else:
-                    # Gene without KEGG term
-                    self.results.append({
-                        'gene_name': gene_name,
-                        'KEGG': ''
-                    })
-    
-    def to_dataframe(self) -> pd.DataFrame:
-        """Convert results to pandas DataFrame with KofamScan-specific columns"""
-        if not self.results:
-            return pd.DataFrame(columns=['gene_name', 'KEGG'])
-        return pd.DataFrame(self.results)
-    
-    def save_to_excel(self, output_file: str):
-        """Save results to Excel file with KofamScan-specific formatting"""
-        df = self.to_dataframe()
-        
-        if df.empty:
-            print(f"Warning: No data to write for {output_file}")
-            return
-        
-        # Create Excel writer
-        with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='Annotations')
-            
-            # Get workbook and worksheet
-            workbook = writer.book
-            worksheet = writer.sheets['Annotations']
-            
-            # Format header
-            header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            header_font = Font(bold=True, color="FFFFFF")
-            
-            for cell in worksheet[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal='center')
-            
-            # Adjust column widths
-            worksheet.column_dimensions['A'].width = 25  # gene_name
-            worksheet.column_dimensions['B'].width = 20  # KEGG
-        
-        print(f"✓ Created: {output_file} ({len(df)} rows)")
+        # Genes without a KEGG term have a single column; their KEGG reads as ''
+        self.df = _read_tsv(self.input_file, names=self.COLUMNS, usecols=self.COLUMNS)
     
     def create_per_gene_output(self) -> pd.DataFrame:
         """Create per-gene output with grouped KEGG terms"""
-        if not self.results:
+        if self.df.empty:
             return pd.DataFrame(columns=['gene_name', 'KEGG'])
         
-        df = pd.DataFrame(self.results)
-        # Group by gene and concatenate KEGG terms
-        per_gene = df.groupby('gene_name')['KEGG'].apply(lambda x: ', '.join(filter(None, x))).reset_index()
-        return per_gene
+        df = self.df
+        genes = pd.Index(df['gene_name'].unique()).sort_values()
+        
+        # Group by gene and concatenate KEGG terms; genes without any keep an
+        # empty cell
+        terms = df[df['KEGG'] != '']
+        per_gene = terms.groupby('gene_name', sort=False, observed=True)['KEGG'].agg(', '.join)
+        return per_gene.reindex(genes, fill_value='').rename_axis('gene_name').reset_index()
 
 
 class InterProScanParser(AnnotationParser):
     """Parser for InterProScan TSV output files"""
     
-    def parse(self):
+    COLUMNS = ['gene', 'analysis', 'score', 'InterPro_accession',
+               'InterPro_description', 'GO', 'Pathways']
+    COL_WIDTHS = [25, 20, 15, 20, 40, 60, 30]
+    CATEGORY_COLUMNS = ['gene', 'analysis']
+    
+    def _parse(self):
         """
         Parse InterProScan TSV format:
         Desired output: gene / analysis (col 4) / score (col 9) / col 12 / col 13 / GO (col 14) / Pathways (col 15)
         TSV columns: 0=Protein accession, 3=Analysis, 8=Score, 11=InterPro accession, 
                     12=InterPro description, 13=GO annotations, 14=Pathways
         """
-        self.results = []
-        
-        if not os.path.exists(self.input_file):
-            print(f"Warning: File not found: {self.input_file}")
-            return
+        # Map the 15 TSV columns onto output names; unused ones keep their index
+        names = list(range(15))
+        for idx, col in zip([0, 3, 8, 11, 12, 13, 14], self.COLUMNS):
+            names[idx] = col
+        df = _read_tsv(self.input_file, names=names, usecols=self.COLUMNS)
         
-        with open(self.input_file, 'r') as f:
-            for line in f:
-                # Skip comments
-                if line.startswith('#'):
-                    continue
-                
-                parts = line.strip().split('\t')
-                if len(parts) < 4:
-                    continue
-                
-                gene_name = parts[0] if len(parts) > 0 else ""
-                analysis = parts[3] if len(parts) > 3 else ""  # Column 4 (0-indexed = 3)
-                score = parts[8] if len(parts) > 8 else ""     # Column 9 (0-indexed = 8)
-                interpro_acc = parts[11] if len(parts) > 11 else ""  # Column 12 (0-indexed = 11)
-                interpro_desc = parts[12] if len(parts) > 12 else ""  # Column 13 (0-indexed = 12)
-                go_terms = parts[13] if len(parts) > 13 else ""      # Column 14 (0-indexed = 13)
-                pathways = parts[14] if len(parts) > 14 else ""      # Column 15 (0-indexed = 14)
-                
-                # Store one row per hit
-                self.results.append({
-                    'gene': gene_name,
-                    'analysis': analysis,
-                    'score': score,
-                    'InterPro_accession': interpro_acc,
-                    'InterPro_description': interpro_desc,
-                    'GO': go_terms,
-                    'Pathways': pathways
-                })
-    
-    def to_dataframe(self) -> pd.DataFrame:
-        """Convert results to pandas DataFrame with InterProScan-specific columns"""
-        if not self.results:
-            return pd.DataFrame(columns=['gene', 'analysis', 'score', 'InterPro_accession', 
-                                        'InterPro_description', 'GO', 'Pathways'])
-        return pd.DataFrame(self.results)
-    
-    def save_to_excel(self, output_file: str):
-        """Save results to Excel file with InterProScan-specific formatting"""
-        df = self.to_dataframe()
-        
-        if df.empty:
-            print(f"Warning: No data to write for {output_file}")
-            return
-        
-        # Create Excel writer
-        with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='Annotations')
-            
-            # Get workbook and worksheet
-            workbook = writer.book
-            worksheet = writer.sheets['Annotations']
-            
-            # Format header
-            header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            header_font = Font(bold=True, color="FFFFFF")
-            
-            for cell in worksheet[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal='center')
-            
-            # Adjust column widths
-            worksheet.column_dimensions['A'].width = 25  # gene
-            worksheet.column_dimensions['B'].width = 20  # analysis
-            worksheet.column_dimensions['C'].width = 15  # score
-            worksheet.column_dimensions['D'].width = 20  # InterPro_accession
-            worksheet.column_dimensions['E'].width = 40  # InterPro_description
-            worksheet.column_dimensions['F'].width = 60  # GO
-            worksheet.column_dimensions['G'].width = 30  # Pathways
-        
-        print(f"✓ Created: {output_file} ({len(df)} rows)")
+        # Truncated lines without an analysis column are not hits; store one row per hit
+        self.df = df[df['analysis'] != ''].reset_index(drop=True)
     
     def create_per_gene_output(self) -> pd.DataFrame:
         """Create per-gene output with grouped GO and Pathways"""
-        if not self.results:
+        if self.df.empty:
             return pd.DataFrame(columns=['gene', 'GO', 'Pathways'])
         
-        df = pd.DataFrame(self.results)
+        df = self.df
+        genes = pd.Index(df['gene'].unique()).sort_values()
         
         # Aggregate GO terms and Pathways per gene
-        def aggregate_values(series):
-            # Filter out empty strings and join unique values
-            values = [v for v in series if v and v.strip()]
-            unique_values = []
-            for v in values:
-                # Split by pipe and comma to handle multiple GO terms in one cell
-                sub_values = v.replace('|', ',').split(',')
-                for sv in sub_values:
-                    sv = sv.strip()
-                    if sv and sv not in unique_values:
-                        unique_values.append(sv)
-            return ', '.join(unique_values)
+        def aggregate_values(column: str) -> pd.Series:
+            # Split by pipe and comma to handle multiple GO terms in one cell,
+            # then join unique values in order of first appearance
+            items = _split_terms(df[column].str.replace('|', ',', regex=False), ',')
+            pairs = pd.DataFrame({
+                'gene': df['gene'].loc[items.index].array,
+                column: items.to_numpy(),
+            }).drop_duplicates()
+            joined = pairs.groupby('gene', sort=False, observed=True)[column].agg(', '.join)
+            return joined.reindex(genes, fill_value='')
         
-        per_gene = df.groupby('gene').agg({
-            'GO': aggregate_values,
-            'Pathways': aggregate_values
-        }).reset_index()
+        per_gene = pd.DataFrame({
+            'GO': aggregate_values('GO'),
+            'Pathways': aggregate_values('Pathways')
+        }).rename_axis('gene').reset_index()
         
         return per_gene
 
@@ -323,345 +568,168 @@ class InterProScanParser(AnnotationParser):
 class EggNOGParser(AnnotationParser):
     """Parser for EggNOG-mapper annotation files"""
     
-    def parse(self):
+    COLUMNS = ['gene', 'Description', 'GOs', 'KEGG_ko', 'KEGG_Pathway',
+               'KEGG_Reaction', 'KEGG_rclass', 'PFAM']
+    COL_WIDTHS = [25, 50, 60, 20, 30, 30, 30, 40]
+    CATEGORY_COLUMNS = []  # One row per gene
+    
+    def _parse(self):
         """
         Parse EggNOG .emapper.annotations format:
         Desired output: gene / Description / GOs / KEGG_ko / KEGG_Pathway / KEGG_Reaction / KEGG_rclass / PFAM
         First 2 rows are comment lines starting with ##
         """
-        self.results = []
-        
-        if not os.path.exists(self.input_file):
-            print(f"Warning: File not found: {self.input_file}")
+        # Header line starts with #query
+        header_idx, header = _locate_header(self.input_file, prefix='#query')
+        if header_idx < 0:
             return
         
-        # Determine if file is gzipped
-        is_gzipped = self.input_file.endswith('.gz')
-        
-        open_func = gzip.open if is_gzipped else open
-        mode = 'rt' if is_gzipped else 'r'
-        
-        with open_func(self.input_file, mode) as f:
-            header_line = None
-            for line in f:
-                # Skip comment lines (including the first 2 rows with ##)
-                if line.startswith('#'):
-                    # Find header line (starts with #query)
-                    if line.startswith('#query'):
-                        header_line = line.strip().lstrip('#').split('\t')
-                    continue
-                
-                parts = line.strip().split('\t')
-                
-                if not header_line or len(parts) != len(header_line):
-                    continue
-                
-                # Create dictionary from header and values
-                row_dict = dict(zip(header_line, parts))
-                
-                gene_name = row_dict.get('query', '')
-                description = row_dict.get('Description', '') or row_dict.get('eggNOG_desc', '')
-                go_terms = row_dict.get('GOs', '') or row_dict.get('GO_terms', '')
-                kegg_ko = row_dict.get('KEGG_ko', '') or row_dict.get('KEGG_KO', '')
-                kegg_pathway = row_dict.get('KEGG_Pathway', '') or row_dict.get('KEGG_pathway', '')
-                kegg_reaction = row_dict.get('KEGG_Reaction', '') or row_dict.get('KEGG_reaction', '')
-                kegg_rclass = row_dict.get('KEGG_rclass', '')
-                pfam = row_dict.get('PFAMs', '') or row_dict.get('PFAM', '')
-                
-                # Store one row per gene
-                self.results.append({
-                    'gene': gene_name,
-                    'Description': description if description != '-' else '',
-                    'GOs': go_terms if go_terms != '-' else '',
-                    'KEGG_ko': kegg_ko if kegg_ko != '-' else '',
-                    'KEGG_Pathway': kegg_pathway if kegg_pathway != '-' else '',
-                    'KEGG_Reaction': kegg_reaction if kegg_reaction != '-' else '',
-                    'KEGG_rclass': kegg_rclass if kegg_rclass != '-' else '',
-                    'PFAM': pfam if pfam != '-' else ''
-                })
-    
-    def to_dataframe(self) -> pd.DataFrame:
-        """Convert results to pandas DataFrame with EggNOG-specific columns"""
-        if not self.results:
-            return pd.DataFrame(columns=['gene', 'Description', 'GOs', 'KEGG_ko', 
-                                        'KEGG_Pathway', 'KEGG_Reaction', 'KEGG_rclass', 'PFAM'])
-        return pd.DataFrame(self.results)
-    
-    def save_to_excel(self, output_file: str):
-        """Save results to Excel file with EggNOG-specific formatting"""
-        df = self.to_dataframe()
-        
-        if df.empty:
-            print(f"Warning: No data to write for {output_file}")
-            return
-        
-        # Create Excel writer
-        with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='Annotations')
-            
-            # Get workbook and worksheet
-            workbook = writer.book
-            worksheet = writer.sheets['Annotations']
-            
-            # Format header
-            header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            header_font = Font(bold=True, color="FFFFFF")
-            
-            for cell in worksheet[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal='center')
-            
-            # Adjust column widths
-            worksheet.column_dimensions['A'].width = 25  # gene
-            worksheet.column_dimensions['B'].width = 50  # Description
-            worksheet.column_dimensions['C'].width = 60  # GOs
-            worksheet.column_dimensions['D'].width = 20  # KEGG_ko
-            worksheet.column_dimensions['E'].width = 30  # KEGG_Pathway
-            worksheet.column_dimensions['F'].width = 30  # KEGG_Reaction
-            worksheet.column_dimensions['G'].width = 30  # KEGG_rclass
-            worksheet.column_dimensions['H'].width = 40  # PFAM
+        # Column names differ between emapper versions; read every known variant
+        sources = {
+            'gene': ['query'],
+            'Description': ['Description', 'eggNOG_desc'],
+            'GOs': ['GOs', 'GO_terms'],
+            'KEGG_ko': ['KEGG_ko', 'KEGG_KO'],
+            'KEGG_Pathway': ['KEGG_Pathway', 'KEGG_pathway'],
+            'KEGG_Reaction': ['KEGG_Reaction', 'KEGG_reaction'],
+            'KEGG_rclass': ['KEGG_rclass'],
+            'PFAM': ['PFAMs', 'PFAM'],
+        }
+        usecols = [col for col in header if any(col in names for names in sources.values())]
+        raw = _read_tsv(self.input_file, names=header, usecols=usecols,
+                        skiprows=header_idx + 1)
         
-        print(f"✓ Created: {output_file} ({len(df)} rows)")
+        # Store one row per gene
+        df = pd.DataFrame({col: _coalesce(raw, *names) for col, names in sources.items()})
+        df.iloc[:, 1:] = df.iloc[:, 1:].apply(_blank_dashes)
+        self.df = df
     
     def create_per_term_output(self) -> pd.DataFrame:
         """Create per-term output with 1 row per GO or KEGG term"""
-        if not self.results:
+        if self.df.empty:
             return pd.DataFrame(columns=['gene', 'term_type', 'term'])
         
-        rows = []
-        for result in self.results:
-            gene = result['gene']
-            
-            # Process GO terms
-            if result['GOs']:
-                go_list = result['GOs'].split(',')
-                for go_term in go_list:
-                    go_term = go_term.strip()
-                    if go_term:
-                        rows.append({
-                            'gene': gene,
-                            'term_type': 'GO',
-                            'term': go_term
-                        })
-            
-            # Process KEGG terms
-            if result['KEGG_ko']:
-                kegg_list = result['KEGG_ko'].split(',')
-                for kegg_term in kegg_list:
-                    kegg_term = kegg_term.strip()
-                    # Remove 'ko:' prefix if present
-                    if kegg_term.startswith('ko:'):
-                        kegg_term = kegg_term[3:]
-                    if kegg_term:
-                        rows.append({
-                            'gene': gene,
-                            'term_type': 'KEGG',
-                            'term': kegg_term
-                        })
+        # GO terms, and KEGG terms with any 'ko:' prefix removed
+        go_terms = _split_terms(self.df['GOs'], ',')
+        kegg_terms = _split_terms(self.df['KEGG_ko'], ',').str.removeprefix(self.KEGG_PREFIX)
+        kegg_terms = kegg_terms[kegg_terms != '']
         
-        return pd.DataFrame(rows)
+        return _stack_terms(self.df['gene'], {
+            'GO': go_terms.to_frame('term'),
+            'KEGG': kegg_terms.to_frame('term'),
+        })
 
 
 class EggNOG7Parser(AnnotationParser):
     """Parser for EggNOG 7 annotator output files"""
     
-    def parse(self):
+    COLUMNS = ['gene', 'eggnog_protein_ID', 'GOs', 'KEGGs']
+    COL_WIDTHS = [25, 30, 80, 40]
+    CATEGORY_COLUMNS = []  # One row per gene
+    
+    def _parse(self):
         """
         Parse EggNOG 7 .eggnog.tsv.gz format with scores:
         Expected format: Column 0 = gene_name, Column 1 = eggnog_protein_ID,
                         Column 12 = KEGG with scores, Column 14 = GO with scores
         Desired output: gene / eggnog_protein_ID / GOs (with scores) / KEGGs (with scores)
         """
-        self.results = []
-        
-        if not os.path.exists(self.input_file):
-            print(f"Warning: File not found: {self.input_file}")
-            return
-        
-        # File should be gzipped
-        with gzip.open(self.input_file, 'rt') as f:
-            header_line = None
+        # Peek at the header and first data line to choose between positional
+        # and header-based columns
+        header, n_skip, width = [], 0, 0
+        with _open_text(self.input_file) as f:
             for line in f:
-                # Skip comment lines
-                if line.startswith('#'):
-                    # Find header line (starts with #query)
-                    if line.startswith('#query'):
-                        header_line = line.strip().lstrip('#').split('\t')
-                    continue
-                
-                parts = line.strip().split('\t')
-                
-                if not parts or len(parts) < 2:
-                    continue
-                
-                # Use positional columns if we have enough columns
-                # Expected: col 0 = gene, col 1 = eggnog_protein_ID
-                # col 12 = KEGG with scores, col 14 = GO with scores
-                if len(parts) >= 15:
-                    gene_name = parts[0]
-                    eggnog_protein_id = parts[1]
-                    kegg_with_scores = parts[12]
-                    go_with_scores = parts[14]
-                elif header_line and len(parts) == len(header_line):
-                    # Fallback to header-based parsing for compatibility
-                    row_dict = dict(zip(header_line, parts))
-                    gene_name = row_dict.get('query', '')
-                    eggnog_protein_id = row_dict.get('seed_ortholog', '')
-                    kegg_with_scores = row_dict.get('KEGG_ko', '') or row_dict.get('KEGG_KO', '')
-                    go_with_scores = row_dict.get('GOs', '') or row_dict.get('GO', '')
-                else:
-                    # Not enough columns or no header
-                    continue
-                
-                # Clean up empty values (-, empty strings)
-                if eggnog_protein_id == '-':
-                    eggnog_protein_id = ''
-                if kegg_with_scores == '-':
-                    kegg_with_scores = ''
-                if go_with_scores == '-':
-                    go_with_scores = ''
-                
-                # Store one row per gene with scores included
-                self.results.append({
-                    'gene': gene_name,
-                    'eggnog_protein_ID': eggnog_protein_id,
-                    'GOs': go_with_scores,
-                    'KEGGs': kegg_with_scores
-                })
-    
-    
-    def to_dataframe(self) -> pd.DataFrame:
-        """Convert results to pandas DataFrame with EggNOG v7 columns"""
-        if not self.results:
-            return pd.DataFrame(columns=['gene', 'eggnog_protein_ID', 'GOs', 'KEGGs'])
-        return pd.DataFrame(self.results)
-    
-    def save_to_excel(self, output_file: str):
-        """Save results to Excel file with EggNOG v7 formatting"""
-        df = self.to_dataframe()
+                if not line.startswith('#'):
+                    width = len(line.rstrip('\r\n').split('\t'))
+                    break
+                # Find header line (starts with #query)
+                if line.startswith('#query'):
+                    header = line.rstrip('\r\n').lstrip('#').split('\t')
+                n_skip += 1
         
-        if df.empty:
-            print(f"Warning: No data to write for {output_file}")
+        if width >= 15:
+            # Expected: col 0 = gene, col 1 = eggnog_protein_ID
+            # col 12 = KEGG with scores, col 14 = GO with scores
+            names = list(range(width))
+            names[0], names[1], names[12], names[14] = 'gene', 'eggnog_protein_ID', 'KEGGs', 'GOs'
+            df = _read_tsv(self.input_file, names=names, usecols=self.COLUMNS,
+                           skiprows=n_skip)
+        elif header and width == len(header):
+            # Fallback to header-based parsing for compatibility
+            usecols = [c for c in header if c in ('query', 'seed_ortholog', 'KEGG_ko', 'KEGG_KO', 'GOs', 'GO')]
+            raw = _read_tsv(self.input_file, names=header, usecols=usecols,
+                            skiprows=n_skip)
+            df = pd.DataFrame({
+                'gene': _coalesce(raw, 'query'),
+                'eggnog_protein_ID': _coalesce(raw, 'seed_ortholog'),
+                'GOs': _coalesce(raw, 'GOs', 'GO'),
+                'KEGGs': _coalesce(raw, 'KEGG_ko', 'KEGG_KO'),
+            })
+        else:
+            # Not enough columns or no header
             return
         
-        # Create Excel writer
-        with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='Annotations')
-            
-            # Get workbook and worksheet
-            workbook = writer.book
-            worksheet = writer.sheets['Annotations']
-            
-            # Format header
-            header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            header_font = Font(bold=True, color="FFFFFF")
-            
-            for cell in worksheet[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal='center')
-            
-            # Adjust column widths
-            worksheet.column_dimensions['A'].width = 25  # gene
-            worksheet.column_dimensions['B'].width = 30  # eggnog_protein_ID
-            worksheet.column_dimensions['C'].width = 80  # GOs
-            worksheet.column_dimensions['D'].width = 40  # KEGGs
-        
-        print(f"✓ Created: {output_file} ({len(df)} rows)")
+        # Clean up empty values (-, empty strings); one row per gene with scores included
+        df = df[self.COLUMNS]
+        df.iloc[:, 1:] = df.iloc[:, 1:].apply(_blank_dashes)
+        self.df = df.reset_index(drop=True)
     
     def create_per_term_output(self) -> pd.DataFrame:
         """Create per-term output with 1 row per GO or KEGG term with scores"""
-        if not self.results:
+        if self.df.empty:
             return pd.DataFrame(columns=['gene', 'term_type', 'term', 'score'])
         
-        rows = []
-        for result in self.results:
-            gene = result['gene']
-            
-            # Process GO terms with scores (format: GO:0030154|2.33;GO:0048856|2.33)
-            if result['GOs']:
-                go_items = result['GOs'].split(';')
-                for go_item in go_items:
-                    go_item = go_item.strip()
-                    if go_item and '|' in go_item:
-                        # Split term and score
-                        parts = go_item.split('|', 1)
-                        if len(parts) == 2:
-                            term, score = parts
-                            rows.append({
-                                'gene': gene,
-                                'term_type': 'GO',
-                                'term': term.strip(),
-                                'score': score.strip()
-                            })
-                        else:
-                            # Malformed data - treat as term without score
-                            rows.append({
-                                'gene': gene,
-                                'term_type': 'GO',
-                                'term': go_item,
-                                'score': ''
-                            })
-                    elif go_item:
-                        # Handle case without score
-                        rows.append({
-                            'gene': gene,
-                            'term_type': 'GO',
-                            'term': go_item,
-                            'score': ''
-                        })
-            
-            # Process KEGG terms with scores (format: K25226|46.22;K00001|50.00)
-            if result['KEGGs']:
-                kegg_items = result['KEGGs'].split(';')
-                for kegg_item in kegg_items:
-                    kegg_item = kegg_item.strip()
-                    if kegg_item and '|' in kegg_item:
-                        # Split term and score
-                        parts = kegg_item.split('|', 1)
-                        if len(parts) == 2:
-                            term, score = parts
-                            # Remove 'ko:' prefix if present
-                            term = term.strip()
-                            if term.startswith('ko:'):
-                                term = term[3:]
-                            rows.append({
-                                'gene': gene,
-                                'term_type': 'KEGG',
-                                'term': term,
-                                'score': score.strip()
-                            })
-                        else:
-                            # Malformed data - treat as term without score
-                            kegg_item_clean = kegg_item.strip()
-                            if kegg_item_clean.startswith('ko:'):
-                                kegg_item_clean = kegg_item_clean[3:]
-                            rows.append({
-                                'gene': gene,
-                                'term_type': 'KEGG',
-                                'term': kegg_item_clean,
-                                'score': ''
-                            })
-                    elif kegg_item:
-                        # Handle case without score
-                        kegg_item_clean = kegg_item.strip()
-                        if kegg_item_clean.startswith('ko:'):
-                            kegg_item_clean = kegg_item_clean[3:]
-                        rows.append({
-                            'gene': gene,
-                            'term_type': 'KEGG',
-                            'term': kegg_item_clean,
-                            'score': ''
-                        })
+        # Items look like GO:0030154|2.33;GO:0048856|2.33 and K25226|46.22;K00001|50.00;
+        # items without a '|' get an empty score
+        def split_scores(values: pd.Series) -> pd.DataFrame:
+            parts = _split_terms(values, ';').str.split('|', n=1)
+            return pd.DataFrame({
+                'term': parts.str[0].str.strip(),
+                'score': parts.str[1].fillna('').str.strip(),
+            })
+        
+        go_terms = split_scores(self.df['GOs'])
+        kegg_terms = split_scores(self.df['KEGGs'])
+        # Remove 'ko:' prefix if present
+        kegg_terms['term'] = kegg_terms['term'].str.removeprefix(self.KEGG_PREFIX)
         
-        return pd.DataFrame(rows)
+        return _stack_terms(self.df['gene'], {'GO': go_terms, 'KEGG': kegg_terms})
 
 
+# One FANTASIA TSV holds the scores of every model, and _fantasia_file parses
+# it for each model in turn; caching the last file read means it is only read
+# once per file.
+@functools.lru_cache(maxsize=1)
+def _load_fantasia_tsv(path: str, mtime_ns: int) -> Optional[pd.DataFrame]:
+    """Read the gene, GO, term count and per-model score columns of a FANTASIA
+    TSV file; mtime_ns only serves as part of the cache key.
+    
+    Returns None, after printing a warning, if the required columns are missing.
+    """
+    # First non-comment line is header
+    header_idx, header = _locate_header(path)
+    if header_idx < 0:
+        return None
+    
+    # Validate required columns exist
+    required_cols = ['accession', 'go_id']
+    if not all(col in header for col in required_cols):
+        print(f"Warning: Missing required columns in {path}")
+        print(f"Expected: {required_cols}")
+        return None
+    
+    usecols = [col for col in header
+               if col in ('accession', 'go_id', 'term_count') or col.startswith('final_score_')]
+    return _read_tsv(path, names=header, usecols=usecols, skiprows=header_idx + 1)
+
 
 class FantasiaParser(AnnotationParser):
     """Parser for FANTASIA AI-driven annotation output files"""
     
+    COLUMNS = ['gene', 'GO', 'term_count', 'final_score']
+    COL_WIDTHS = [25, 20, 15, 15]
+    CATEGORY_COLUMNS = ['gene']
+    
     # Model names mapping for output file naming
     MODEL_NAMES = {
         'ESM_L0': 'ESM-2',
@@ -682,116 +750,45 @@ class FantasiaParser(AnnotationParser):
         super().__init__(input_file)
         self.model_suffix = model_suffix
     
-    def parse(self):
+    def _cache_key(self) -> str:
+        """Prefix of this parser's cache entries; one per model"""
+        return f"{super()._cache_key()}.{self.model_suffix or 'all'}"
+    
+    def _parse(self):
         """
         Parse FANTASIA TSV format:
         Desired output: gene / GO / term_count / final_score
         Columns: accession, go_id, term_count, final_score_<model>, proteins
         """
-        self.results = []
-        
-        if not os.path.exists(self.input_file):
-            print(f"Warning: File not found: {self.input_file}")
+        raw = _load_fantasia_tsv(os.path.abspath(self.input_file),
+                                 self.input_stat.st_mtime_ns)
+        if raw is None:
             return
         
-        with open(self.input_file, 'r') as f:
-            header_line = None
-            for line in f:
-                # Skip comments
-                if line.startswith('#'):
-                    continue
-                
-                # First non-comment line is header
-                if header_line is None:
-                    header_line = line.strip().split('\t')
-                    # Validate required columns exist
-                    required_cols = ['accession', 'go_id']
-                    if not all(col in header_line for col in required_cols):
-                        print(f"Warning: Missing required columns in {self.input_file}")
-                        print(f"Expected: {required_cols}")
-                        return
-                    continue
-                
-                parts = line.strip().split('\t')
-                
-                # Skip lines that don't match header length
-                if len(parts) != len(header_line):
-                    continue
-                
-                # Create dictionary from header and values
-                row_dict = dict(zip(header_line, parts))
-                
-                gene_name = row_dict.get('accession', '')
-                go_id = row_dict.get('go_id', '')
-                term_count = row_dict.get('term_count', '')
-                
-                # Skip if no GO term
-                if not go_id or go_id == '-':
-                    continue
-                
-                # Get final_score for the specific model
-                score_col = f'final_score_{self.model_suffix}' if self.model_suffix else None
-                final_score = row_dict.get(score_col, '') if score_col else ''
-                
-                # Skip if this model has no score for this entry
-                if self.model_suffix and (not final_score or final_score.strip() == ''):
-                    continue
-                
-                self.results.append({
-                    'gene': gene_name,
-                    'GO': go_id,
-                    'term_count': term_count,
-                    'final_score': final_score
-                })
-    
-    def to_dataframe(self) -> pd.DataFrame:
-        """Convert results to pandas DataFrame with FANTASIA-specific column names"""
-        if not self.results:
-            return pd.DataFrame(columns=['gene', 'GO', 'term_count', 'final_score'])
-        return pd.DataFrame(self.results)
-    
-    def save_to_excel(self, output_file: str):
-        """Save results to Excel file with FANTASIA-specific formatting"""
-        df = self.to_dataframe()
-        
-        if df.empty:
-            print(f"Warning: No data to write for {output_file}")
-            return
-        
-        # Create Excel writer
-        with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='Annotations')
-            
-            # Get workbook and worksheet
-            workbook = writer.book
-            worksheet = writer.sheets['Annotations']
-            
-            # Format header
-            header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            header_font = Font(bold=True, color="FFFFFF")
-            
-            for cell in worksheet[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal='center')
-            
-            # Adjust column widths for FANTASIA format
-            worksheet.column_dimensions['A'].width = 25  # gene
-            worksheet.column_dimensions['B'].width = 20  # GO
-            worksheet.column_dimensions['C'].width = 15  # term_count
-            worksheet.column_dimensions['D'].width = 15  # final_score
+        # Get final_score for the specific model
+        score_col = f'final_score_{self.model_suffix}' if self.model_suffix else None
+        df = pd.DataFrame({
+            'gene': raw['accession'],
+            'GO': raw['go_id'],
+            'term_count': _coalesce(raw, 'term_count'),
+            'final_score': _coalesce(raw, score_col) if score_col else '',
+        })
         
-        print(f"✓ Created: {output_file} ({len(df)} rows)")
+        # Skip rows without a GO term, and those this model has no score for
+        keep = (df['GO'] != '') & (df['GO'] != '-')
+        if self.model_suffix:
+            keep &= df['final_score'].str.strip() != ''
+        self.df = df[keep].reset_index(drop=True)
     
     def create_per_gene_output(self) -> pd.DataFrame:
         """Create per-gene output with grouped GO terms"""
-        if not self.results:
+        if self.df.empty:
             return pd.DataFrame(columns=['gene', 'GO'])
         
-        df = pd.DataFrame(self.results)
-        # Group by gene and concatenate GO terms
-        per_gene = df.groupby('gene')['GO'].apply(lambda x: ', '.join(x)).reset_index()
-        return per_gene
+        df = self.df
+        # Group by gene and concatenate GO terms; genes are categorical, so
+        # the output is ordered by their codes without sorting strings
+        return df.groupby('gene', observed=True, as_index=False)['GO'].agg(', '.join)
 
 
 def find_files(directory: str, pattern: str) -> List[str]:
@@ -800,6 +797,14 @@ def find_files(directory: str, pattern: str) -> List[str]:
     if not path.exists():
         return []
     
+    # '*<suffix>' patterns (all the ones used here) only need a suffix test
+    # per directory entry, without glob's pattern matching
+    suffix = pattern[1:]
+    if pattern.startswith('*') and not any(c in suffix for c in '*?[/'):
+        with os.scandir(directory) as entries:
+            return sorted(entry.path for entry in entries
+                          if entry.name.endswith(suffix) and entry.is_file())
+    
     files = []
     for file_path in path.glob(pattern):
         if file_path.is_file():
@@ -808,300 +813,323 @@ def find_files(directory: str, pattern: str) -> List[str]:
     return sorted(files)
 
 
-def process_kofamscan(results_dir: str, output_dir: str):
-    """Process all KofamScan output files"""
-    print("\n" + "="*60)
-    print("Processing KofamScan Results")
-    print("="*60)
+def _init_worker(use_cache: bool, cache_dir: Optional[str], max_excel_rows: Optional[int]):
+    """Carry the cache and output settings from main() over to a worker process"""
+    global USE_CACHE, CACHE_DIR, MAX_EXCEL_ROWS
+    USE_CACHE = use_cache
+    CACHE_DIR = cache_dir
+    MAX_EXCEL_ROWS = max_excel_rows
+
+
+def worker_pool(jobs: int):
+    """
+    Create the process pool that parses annotation files and writes Excel files.
     
-    kofam_dir = os.path.join(results_dir, 'kofamscan')
-    if not os.path.exists(kofam_dir):
-        print(f"Warning: KofamScan directory not found: {kofam_dir}")
-        return
+    Args:
+        jobs: Number of worker processes; 1 runs everything in this process
+        
+    Returns:
+        Context manager yielding a ProcessPoolExecutor, or None for jobs <= 1
+    """
+    if jobs <= 1:
+        return contextlib.nullcontext()
+    return ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                               initargs=(USE_CACHE, CACHE_DIR, MAX_EXCEL_ROWS))
+
+
+def submit_task(executor: Optional[ProcessPoolExecutor], fn, *args) -> Future:
+    """
+    Queue fn(*args) on the worker pool, capturing what it prints.
     
-    # Find all mapper files
-    mapper_files = find_files(kofam_dir, '*_kofam_mapper.tsv')
+    The output is returned rather than printed so files processed in worker
+    processes are still reported in a fixed order.
     
-    if not mapper_files:
-        print("No KofamScan mapper files found")
-        return
+    Args:
+        executor: Pool from worker_pool, or None to run fn right away
+        fn: Top-level function (worker processes must be able to pickle it)
+        *args: Arguments for fn
+        
+    Returns:
+        Future holding fn's printed output
+    """
+    if executor is not None:
+        return executor.submit(_run_captured, fn, *args)
+    return _completed(_run_captured(fn, *args))
+
+
+def _run_captured(fn, *args) -> str:
+    """Run fn(*args) and return what it printed"""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        fn(*args)
+    return output.getvalue()
+
+
+def _completed(output: str) -> Future:
+    """Wrap already captured console output in a finished Future"""
+    future = Future()
+    future.set_result(output)
+    return future
+
+
+def _kofamscan_file(mapper_file: str, output_dir: str):
+    """Create the per-term and per-gene Excel files for one KofamScan file"""
+    basename = os.path.basename(mapper_file).removesuffix('_kofam_mapper.tsv')
+    
+    parser = KofamScanParser(mapper_file)
+    parser.parse()
     
-    print(f"Found {len(mapper_files)} KofamScan file(s)")
+    # Save per-term output (1 row = 1 KEGG term)
+    output_file_per_term = os.path.join(output_dir, f"{basename}_kofamscan_per_term.xlsx")
+    parser.save_to_excel(output_file_per_term)
     
-    for mapper_file in mapper_files:
-        basename = os.path.basename(mapper_file).replace('_kofam_mapper.tsv', '')
+    # Save per-gene output (1 row = 1 gene with grouped KEGG terms)
+    per_gene_df = parser.create_per_gene_output()
+    if not per_gene_df.empty:
+        output_file_per_gene = os.path.join(output_dir, f"{basename}_kofamscan_per_gene.xlsx")
+        # Column widths: gene_name, KEGG (grouped)
+        _write_xlsx(per_gene_df, output_file_per_gene, [25, 60])
         
-        parser = KofamScanParser(mapper_file)
-        parser.parse()
+        print(f"✓ Created: {output_file_per_gene} ({len(per_gene_df)} rows)")
+
+
+def process_kofamscan(results_dir: str, output_dir: str,
+                      executor: Optional[ProcessPoolExecutor] = None) -> List[Future]:
+    """Process all KofamScan output files; returns the console output of each step"""
+    log = io.StringIO()
+    mapper_files = []
+    with contextlib.redirect_stdout(log):
+        print("\n" + "="*60)
+        print("Processing KofamScan Results")
+        print("="*60)
         
-        # Save per-term output (1 row = 1 KEGG term)
-        output_file_per_term = os.path.join(output_dir, f"{basename}_kofamscan_per_term.xlsx")
-        parser.save_to_excel(output_file_per_term)
-        
-        # Save per-gene output (1 row = 1 gene with grouped KEGG terms)
-        per_gene_df = parser.create_per_gene_output()
-        if not per_gene_df.empty:
-            output_file_per_gene = os.path.join(output_dir, f"{basename}_kofamscan_per_gene.xlsx")
-            with pd.ExcelWriter(output_file_per_gene, engine='openpyxl') as writer:
-                per_gene_df.to_excel(writer, index=False, sheet_name='Annotations')
-                
-                # Get workbook and worksheet
-                workbook = writer.book
-                worksheet = writer.sheets['Annotations']
-                
-                # Format header
-                header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-                header_font = Font(bold=True, color="FFFFFF")
-                
-                for cell in worksheet[1]:
-                    cell.fill = header_fill
-                    cell.font = header_font
-                    cell.alignment = Alignment(horizontal='center')
-                
-                # Adjust column widths
-                worksheet.column_dimensions['A'].width = 25  # gene_name
-                worksheet.column_dimensions['B'].width = 60  # KEGG (grouped)
+        kofam_dir = os.path.join(results_dir, 'kofamscan')
+        if not os.path.exists(kofam_dir):
+            print(f"Warning: KofamScan directory not found: {kofam_dir}")
+        else:
+            # Find all mapper files
+            mapper_files = find_files(kofam_dir, '*_kofam_mapper.tsv')
             
-            print(f"✓ Created: {output_file_per_gene} ({len(per_gene_df)} rows)")
+            if not mapper_files:
+                print("No KofamScan mapper files found")
+            else:
+                print(f"Found {len(mapper_files)} KofamScan file(s)")
+    
+    return [_completed(log.getvalue())] + [
+        submit_task(executor, _kofamscan_file, mapper_file, output_dir)
+        for mapper_file in mapper_files
+    ]
 
 
-def process_interproscan(results_dir: str, output_dir: str):
-    """Process all InterProScan output files"""
-    print("\n" + "="*60)
-    print("Processing InterProScan Results")
-    print("="*60)
-    
-    interpro_dir = os.path.join(results_dir, 'interproscan')
-    if not os.path.exists(interpro_dir):
-        print(f"Warning: InterProScan directory not found: {interpro_dir}")
-        return
-    
-    # Find all TSV files
-    tsv_files = find_files(interpro_dir, '*.tsv')
+def _interproscan_file(tsv_file: str, output_dir: str):
+    """Create the per-term and per-gene Excel files for one InterProScan file"""
+    basename = os.path.basename(tsv_file).removesuffix('.tsv')
     
-    if not tsv_files:
-        print("No InterProScan TSV files found")
-        return
+    parser = InterProScanParser(tsv_file)
+    parser.parse()
     
-    print(f"Found {len(tsv_files)} InterProScan file(s)")
+    # Save per-term output (1 row = 1 hit)
+    output_file_per_term = os.path.join(output_dir, f"{basename}_interproscan_per_term.xlsx")
+    parser.save_to_excel(output_file_per_term)
     
-    for tsv_file in tsv_files:
-        basename = os.path.basename(tsv_file).replace('.tsv', '')
+    # Save per-gene output (1 row = 1 gene with grouped GO and Pathways)
+    per_gene_df = parser.create_per_gene_output()
+    if not per_gene_df.empty:
+        output_file_per_gene = os.path.join(output_dir, f"{basename}_interproscan_per_gene.xlsx")
+        # Column widths: gene, GO (grouped), Pathways (grouped)
+        _write_xlsx(per_gene_df, output_file_per_gene, [25, 80, 40])
         
-        parser = InterProScanParser(tsv_file)
-        parser.parse()
-        
-        # Save per-term output (1 row = 1 hit)
-        output_file_per_term = os.path.join(output_dir, f"{basename}_interproscan_per_term.xlsx")
-        parser.save_to_excel(output_file_per_term)
+        print(f"✓ Created: {output_file_per_gene} ({len(per_gene_df)} rows)")
+
+
+def process_interproscan(results_dir: str, output_dir: str,
+                         executor: Optional[ProcessPoolExecutor] = None) -> List[Future]:
+    """Process all InterProScan output files; returns the console output of each step"""
+    log = io.StringIO()
+    tsv_files = []
+    with contextlib.redirect_stdout(log):
+        print("\n" + "="*60)
+        print("Processing InterProScan Results")
+        print("="*60)
         
-        # Save per-gene output (1 row = 1 gene with grouped GO and Pathways)
-        per_gene_df = parser.create_per_gene_output()
-        if not per_gene_df.empty:
-            output_file_per_gene = os.path.join(output_dir, f"{basename}_interproscan_per_gene.xlsx")
-            with pd.ExcelWriter(output_file_per_gene, engine='openpyxl') as writer:
-                per_gene_df.to_excel(writer, index=False, sheet_name='Annotations')
-                
-                # Get workbook and worksheet
-                workbook = writer.book
-                worksheet = writer.sheets['Annotations']
-                
-                # Format header
-                header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-                header_font = Font(bold=True, color="FFFFFF")
-                
-                for cell in worksheet[1]:
-                    cell.fill = header_fill
-                    cell.font = header_font
-                    cell.alignment = Alignment(horizontal='center')
-                
-                # Adjust column widths
-                worksheet.column_dimensions['A'].width = 25  # gene
-                worksheet.column_dimensions['B'].width = 80  # GO (grouped)
-                worksheet.column_dimensions['C'].width = 40  # Pathways (grouped)
+        interpro_dir = os.path.join(results_dir, 'interproscan')
+        if not os.path.exists(interpro_dir):
+            print(f"Warning: InterProScan directory not found: {interpro_dir}")
+        else:
+            # Find all TSV files
+            tsv_files = find_files(interpro_dir, '*.tsv')
             
-            print(f"✓ Created: {output_file_per_gene} ({len(per_gene_df)} rows)")
+            if not tsv_files:
+                print("No InterProScan TSV files found")
+            else:
+                print(f"Found {len(tsv_files)} InterProScan file(s)")
+    
+    return [_completed(log.getvalue())] + [
+        submit_task(executor, _interproscan_file, tsv_file, output_dir)
+        for tsv_file in tsv_files
+    ]
 
 
-def process_eggnog(results_dir: str, output_dir: str):
-    """Process all EggNOG-mapper output files"""
-    print("\n" + "="*60)
-    print("Processing EggNOG-mapper Results")
-    print("="*60)
+def _eggnog_v5_file(annot_file: str, output_dir: str):
+    """Create the per-gene and per-term Excel files for one EggNOG v5 annotation file"""
+    # Extract sample name from path
+    basename = os.path.basename(annot_file).removesuffix('.emapper.annotations')
     
-    # Check for both v5 and v7 outputs
-    eggnog_v5_dir = os.path.join(results_dir, 'eggnog', 'v5')
-    eggnog_v7_dir = os.path.join(results_dir, 'eggnog7')
-    
-    # Process v5 outputs
-    if os.path.exists(eggnog_v5_dir):
-        print("\nProcessing EggNOG v5 outputs...")
-        # Find annotation files in subdirectories
-        annotation_files = []
-        for root, dirs, files in os.walk(eggnog_v5_dir):
-            for file in files:
-                if file.endswith('.emapper.annotations'):
-                    annotation_files.append(os.path.join(root, file))
-        
-        if annotation_files:
-            print(f"Found {len(annotation_files)} EggNOG v5 annotation file(s)")
-            for annot_file in annotation_files:
-                # Extract sample name from path
-                basename = os.path.basename(annot_file).replace('.emapper.annotations', '')
-                
-                parser = EggNOGParser(annot_file)
-                parser.parse()
-                
-                # Save per-gene output (1 row = 1 gene, already the desired format)
-                output_file_per_gene = os.path.join(output_dir, f"{basename}_eggnog_v5_per_gene.xlsx")
-                parser.save_to_excel(output_file_per_gene)
-                
-                # Save per-term output (1 row = 1 GO or KEGG term)
-                per_term_df = parser.create_per_term_output()
-                if not per_term_df.empty:
-                    output_file_per_term = os.path.join(output_dir, f"{basename}_eggnog_v5_per_term.xlsx")
-                    with pd.ExcelWriter(output_file_per_term, engine='openpyxl') as writer:
-                        per_term_df.to_excel(writer, index=False, sheet_name='Annotations')
-                        
-                        # Get workbook and worksheet
-                        workbook = writer.book
-                        worksheet = writer.sheets['Annotations']
-                        
-                        # Format header
-                        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-                        header_font = Font(bold=True, color="FFFFFF")
-                        
-                        for cell in worksheet[1]:
-                            cell.fill = header_fill
-                            cell.font = header_font
-                            cell.alignment = Alignment(horizontal='center')
-                        
-                        # Adjust column widths
-                        worksheet.column_dimensions['A'].width = 25  # gene
-                        worksheet.column_dimensions['B'].width = 15  # term_type
-                        worksheet.column_dimensions['C'].width = 30  # term
-                    
-                    print(f"✓ Created: {output_file_per_term} ({len(per_term_df)} rows)")
-        else:
-            print("No EggNOG v5 annotation files found")
+    parser = EggNOGParser(annot_file)
+    parser.parse()
     
-    # Process v7 outputs
-    if os.path.exists(eggnog_v7_dir):
-        print("\nProcessing EggNOG v7 outputs...")
-        tsv_gz_files = find_files(eggnog_v7_dir, '*.eggnog.tsv.gz')
-        
-        if tsv_gz_files:
-            print(f"Found {len(tsv_gz_files)} EggNOG v7 annotation file(s)")
-            for tsv_gz_file in tsv_gz_files:
-                basename = os.path.basename(tsv_gz_file).replace('.eggnog.tsv.gz', '')
-                
-                parser = EggNOG7Parser(tsv_gz_file)
-                parser.parse()
-                
-                # Save per-gene output (1 row = 1 gene)
-                output_file_per_gene = os.path.join(output_dir, f"{basename}_eggnog_v7_per_gene.xlsx")
-                parser.save_to_excel(output_file_per_gene)
-                
-                # Save per-term output (1 row = 1 GO or KEGG term)
-                per_term_df = parser.create_per_term_output()
-                if not per_term_df.empty:
-                    output_file_per_term = os.path.join(output_dir, f"{basename}_eggnog_v7_per_term.xlsx")
-                    with pd.ExcelWriter(output_file_per_term, engine='openpyxl') as writer:
-                        per_term_df.to_excel(writer, index=False, sheet_name='Annotations')
-                        
-                        # Get workbook and worksheet
-                        workbook = writer.book
-                        worksheet = writer.sheets['Annotations']
-                        
-                        # Format header
-                        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-                        header_font = Font(bold=True, color="FFFFFF")
-                        
-                        for cell in worksheet[1]:
-                            cell.fill = header_fill
-                            cell.font = header_font
-                            cell.alignment = Alignment(horizontal='center')
-                        
-                        # Adjust column widths
-                        worksheet.column_dimensions['A'].width = 25  # gene
-                        worksheet.column_dimensions['B'].width = 15  # term_type
-                        worksheet.column_dimensions['C'].width = 30  # term
-                        worksheet.column_dimensions['D'].width = 15  # score
-                    
-                    print(f"✓ Created: {output_file_per_term} ({len(per_term_df)} rows)")
-        else:
-            print("No EggNOG v7 annotation files found")
+    # Save per-gene output (1 row = 1 gene, already the desired format)
+    output_file_per_gene = os.path.join(output_dir, f"{basename}_eggnog_v5_per_gene.xlsx")
+    parser.save_to_excel(output_file_per_gene)
     
-    if not os.path.exists(eggnog_v5_dir) and not os.path.exists(eggnog_v7_dir):
-        print("Warning: No EggNOG directories found")
+    # Save per-term output (1 row = 1 GO or KEGG term)
+    per_term_df = parser.create_per_term_output()
+    if not per_term_df.empty:
+        output_file_per_term = os.path.join(output_dir, f"{basename}_eggnog_v5_per_term.xlsx")
+        # Column widths: gene, term_type, term
+        _write_xlsx(per_term_df, output_file_per_term, [25, 15, 30])
+        
+        print(f"✓ Created: {output_file_per_term} ({len(per_term_df)} rows)")
 
 
-def process_fantasia(results_dir: str, output_dir: str):
-    """Process all FANTASIA output files and create one Excel per model"""
-    print("\n" + "="*60)
-    print("Processing FANTASIA Results")
-    print("="*60)
+def _eggnog_v7_file(tsv_gz_file: str, output_dir: str):
+    """Create the per-gene and per-term Excel files for one EggNOG v7 annotation file"""
+    basename = os.path.basename(tsv_gz_file).removesuffix('.eggnog.tsv.gz')
     
-    fantasia_dir = os.path.join(results_dir, 'fantasia')
-    if not os.path.exists(fantasia_dir):
-        print(f"Warning: FANTASIA directory not found: {fantasia_dir}")
-        return
+    parser = EggNOG7Parser(tsv_gz_file)
+    parser.parse()
     
-    # Find all TSV files (FANTASIA outputs)
-    tsv_files = find_files(fantasia_dir, '*.tsv')
+    # Save per-gene output (1 row = 1 gene)
+    output_file_per_gene = os.path.join(output_dir, f"{basename}_eggnog_v7_per_gene.xlsx")
+    parser.save_to_excel(output_file_per_gene)
     
-    if not tsv_files:
-        print("No FANTASIA TSV files found")
-        return
+    # Save per-term output (1 row = 1 GO or KEGG term)
+    per_term_df = parser.create_per_term_output()
+    if not per_term_df.empty:
+        output_file_per_term = os.path.join(output_dir, f"{basename}_eggnog_v7_per_term.xlsx")
+        # Column widths: gene, term_type, term, score
+        _write_xlsx(per_term_df, output_file_per_term, [25, 15, 30, 15])
+        
+        print(f"✓ Created: {output_file_per_term} ({len(per_term_df)} rows)")
+
+
+def process_eggnog(results_dir: str, output_dir: str,
+                   executor: Optional[ProcessPoolExecutor] = None) -> List[Future]:
+    """Process all EggNOG-mapper output files; returns the console output of each step"""
+    steps = []
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        print("\n" + "="*60)
+        print("Processing EggNOG-mapper Results")
+        print("="*60)
+        
+        # Check for both v5 and v7 outputs
+        eggnog_v5_dir = os.path.join(results_dir, 'eggnog', 'v5')
+        eggnog_v7_dir = os.path.join(results_dir, 'eggnog7')
+        
+        # Process v5 outputs
+        if os.path.exists(eggnog_v5_dir):
+            print("\nProcessing EggNOG v5 outputs...")
+            # Find annotation files in subdirectories
+            annotation_files = sorted(
+                str(p) for p in Path(eggnog_v5_dir).rglob('*.emapper.annotations') if p.is_file()
+            )
+            
+            if annotation_files:
+                print(f"Found {len(annotation_files)} EggNOG v5 annotation file(s)")
+                steps.append(_completed(log.getvalue()))
+                steps.extend(submit_task(executor, _eggnog_v5_file, annot_file, output_dir)
+                             for annot_file in annotation_files)
+                log = io.StringIO()
+            else:
+                print("No EggNOG v5 annotation files found")
     
-    print(f"Found {len(tsv_files)} FANTASIA file(s)")
+    with contextlib.redirect_stdout(log):
+        # Process v7 outputs
+        if os.path.exists(eggnog_v7_dir):
+            print("\nProcessing EggNOG v7 outputs...")
+            tsv_gz_files = find_files(eggnog_v7_dir, '*.eggnog.tsv.gz')
+            
+            if tsv_gz_files:
+                print(f"Found {len(tsv_gz_files)} EggNOG v7 annotation file(s)")
+                steps.append(_completed(log.getvalue()))
+                steps.extend(submit_task(executor, _eggnog_v7_file, tsv_gz_file, output_dir)
+                             for tsv_gz_file in tsv_gz_files)
+                log = io.StringIO()
+            else:
+                print("No EggNOG v7 annotation files found")
+        
+        if not os.path.exists(eggnog_v5_dir) and not os.path.exists(eggnog_v7_dir):
+            print("Warning: No EggNOG directories found")
     
-    # Define the models to process
-    models = ['ESM_L0', 'Prot-T5_L0', 'Prost-T5_L0', 'Ankh3-Large_L0', 'ESM3c_L0']
+    steps.append(_completed(log.getvalue()))
+    return steps
+
+
+def _fantasia_model(tsv_file: str, model_suffix: str, model_name: str, output_prefix: str):
+    """Create the per-term and per-gene Excel files for one FANTASIA model;
+    their paths start with output_prefix"""
+    parser = FantasiaParser(tsv_file, model_suffix=model_suffix)
+    parser.parse()
     
-    for tsv_file in tsv_files:
-        basename = os.path.basename(tsv_file).replace('.tsv', '')
+    # Only save if there are results for this model
+    if not parser.df.empty:
+        # Save per-term output (1 row = 1 GO term)
+        output_file_per_term = f"{output_prefix}_{model_name}_per_term.xlsx"
+        parser.save_to_excel(output_file_per_term)
         
-        # Process each model separately
-        for model_suffix in models:
-            model_name = FantasiaParser.MODEL_NAMES.get(model_suffix, model_suffix)
+        # Save per-gene output (1 row = 1 gene with grouped GO terms)
+        per_gene_df = parser.create_per_gene_output()
+        if not per_gene_df.empty:
+            output_file_per_gene = f"{output_prefix}_{model_name}_per_gene.xlsx"
+            # Column widths: gene, GO (grouped)
+            _write_xlsx(per_gene_df, output_file_per_gene, [25, 80])
             
-            parser = FantasiaParser(tsv_file, model_suffix=model_suffix)
-            parser.parse()
+            print(f"✓ Created: {output_file_per_gene} ({len(per_gene_df)} rows)")
+    else:
+        print(f"  Skipping {model_name}: No annotations found")
+
+
+def _fantasia_file(tsv_file: str, models: List[Tuple[str, str]], output_dir: str):
+    """Create the Excel files of each (model suffix, model name) for one TSV file"""
+    basename = os.path.basename(tsv_file).removesuffix('.tsv')
+    output_prefix = os.path.join(output_dir, f"{basename}_fantasia")
+    for model_suffix, model_name in models:
+        _fantasia_model(tsv_file, model_suffix, model_name, output_prefix)
+
+
+def process_fantasia(results_dir: str, output_dir: str,
+                     executor: Optional[ProcessPoolExecutor] = None) -> List[Future]:
+    """Process all FANTASIA output files and create one Excel per model;
+    returns the console output of each step"""
+    log = io.StringIO()
+    tsv_files = []
+    with contextlib.redirect_stdout(log):
+        print("\n" + "="*60)
+        print("Processing FANTASIA Results")
+        print("="*60)
+        
+        fantasia_dir = os.path.join(results_dir, 'fantasia')
+        if not os.path.exists(fantasia_dir):
+            print(f"Warning: FANTASIA directory not found: {fantasia_dir}")
+        else:
+            # Find all TSV files (FANTASIA outputs)
+            tsv_files = find_files(fantasia_dir, '*.tsv')
             
-            # Only save if there are results for this model
-            if parser.results:
-                # Save per-term output (1 row = 1 GO term)
-                output_file_per_term = os.path.join(output_dir, f"{basename}_fantasia_{model_name}_per_term.xlsx")
-                parser.save_to_excel(output_file_per_term)
-                
-                # Save per-gene output (1 row = 1 gene with grouped GO terms)
-                per_gene_df = parser.create_per_gene_output()
-                if not per_gene_df.empty:
-                    output_file_per_gene = os.path.join(output_dir, f"{basename}_fantasia_{model_name}_per_gene.xlsx")
-                    with pd.ExcelWriter(output_file_per_gene, engine='openpyxl') as writer:
-                        per_gene_df.to_excel(writer, index=False, sheet_name='Annotations')
-                        
-                        # Get workbook and worksheet
-                        workbook = writer.book
-                        worksheet = writer.sheets['Annotations']
-                        
-                        # Format header
-                        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-                        header_font = Font(bold=True, color="FFFFFF")
-                        
-                        for cell in worksheet[1]:
-                            cell.fill = header_fill
-                            cell.font = header_font
-                            cell.alignment = Alignment(horizontal='center')
-                        
-                        # Adjust column widths
-                        worksheet.column_dimensions['A'].width = 25  # gene
-                        worksheet.column_dimensions['B'].width = 80  # GO (grouped)
-                    
-                    print(f"✓ Created: {output_file_per_gene} ({len(per_gene_df)} rows)")
+            if not tsv_files:
+                print("No FANTASIA TSV files found")
             else:
-                print(f"  Skipping {model_name}: No annotations found")
+                print(f"Found {len(tsv_files)} FANTASIA file(s)")
+    
+    # Define the models to process, with the names used in output files
+    models = list(FantasiaParser.MODEL_NAMES.items())
+    
+    # Process each model separately; the models of one file share a task so
+    # the file is only read once
+    return [_completed(log.getvalue())] + [
+        submit_task(executor, _fantasia_file, tsv_file, models, output_dir)
+        for tsv_file in tsv_files
+    ]
 
 
 def _save_combined_excel(df: pd.DataFrame, output_file: str, sheet_name: str = 'Combined'):
@@ -1110,23 +1138,8 @@ def _save_combined_excel(df: pd.DataFrame, output_file: str, sheet_name: str = '
         print(f"Warning: No data to write for {output_file}")
         return
 
-    with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-        df.to_excel(writer, index=False, sheet_name=sheet_name)
-
-        workbook = writer.book
-        worksheet = writer.sheets[sheet_name]
-
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF")
-
-        for cell in worksheet[1]:
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center')
-
-        worksheet.column_dimensions['A'].width = 25   # gene
-        worksheet.column_dimensions['B'].width = 80   # GO
-        worksheet.column_dimensions['C'].width = 60   # KEGG
+    # Column widths: gene, GO, KEGG
+    _write_xlsx(df, output_file, [25, 80, 60], sheet_name=sheet_name)
 
     print(f"✓ Created: {output_file} ({len(df)} rows)")
 
@@ -1150,13 +1163,28 @@ def _extract_terms(value: str, separator: str = ',', strip_scores: bool = False)
         if strip_scores and '|' in item:
             item = item.split('|', 1)[0].strip()
         # Remove ko: prefix for KEGG terms
-        if item.startswith('ko:'):
-            item = item[3:]
+        item = item.removeprefix(AnnotationParser.KEGG_PREFIX)
         if item:
             terms.add(item)
     return terms
 
 
+def _read_per_gene(excel_path: str) -> pd.DataFrame:
+    """Read a per-gene table, from its full Parquet copy if the workbook was
+    truncated by --max-excel-rows."""
+    parquet_path = os.path.splitext(excel_path)[0] + '.parquet'
+    if os.path.exists(parquet_path):
+        return pd.read_parquet(parquet_path)
+    return pd.read_excel(excel_path)
+
+
+def _column_values(df: pd.DataFrame, column: str) -> list:
+    """Values of ``column`` as a list, or empty strings if it is absent."""
+    if column in df:
+        return df[column].tolist()
+    return [''] * len(df)
+
+
 def _detect_samples(output_dir: str) -> List[str]:
     """Detect sample names from existing per-gene Excel files in the output directory."""
     samples = set()
@@ -1220,44 +1248,42 @@ def _combine_sample(output_dir: str, sample: str):
 
     # --- KofamScan (KEGG only) ---
     if os.path.exists(kofam_file):
-        df = pd.read_excel(kofam_file)
-        for _, row in df.iterrows():
-            gene = str(row.get('gene_name', '')).strip()
+        df = _read_per_gene(kofam_file)
+        for gene, kegg in zip(_column_values(df, 'gene_name'), _column_values(df, 'KEGG')):
+            gene = str(gene).strip()
             if not gene or gene == 'nan':
                 continue
             _ensure_gene(gene)
-            gene_kegg[gene].update(_extract_terms(row.get('KEGG', '')))
+            gene_kegg[gene].update(_extract_terms(kegg))
         print(f"  ✓ Loaded KofamScan: {kofam_file}")
     else:
         print(f"  ⚠ KofamScan file not found: {kofam_file}")
 
     # --- InterProScan (GO only) ---
     if os.path.exists(interpro_file):
-        df = pd.read_excel(interpro_file)
-        for _, row in df.iterrows():
-            gene = str(row.get('gene', '')).strip()
+        df = _read_per_gene(interpro_file)
+        for gene, go in zip(_column_values(df, 'gene'), _column_values(df, 'GO')):
+            gene = str(gene).strip()
             if not gene or gene == 'nan':
                 continue
             _ensure_gene(gene)
-            gene_go[gene].update(_extract_terms(row.get('GO', '')))
+            gene_go[gene].update(_extract_terms(go))
         print(f"  ✓ Loaded InterProScan: {interpro_file}")
     else:
         print(f"  ⚠ InterProScan file not found: {interpro_file}")
 
     # --- EggNOG v7 (GO and KEGG, scores stripped) ---
     if os.path.exists(eggnog_v7_file):
-        df = pd.read_excel(eggnog_v7_file)
-        for _, row in df.iterrows():
-            gene = str(row.get('gene', '')).strip()
+        df = _read_per_gene(eggnog_v7_file)
+        rows = zip(_column_values(df, 'gene'), _column_values(df, 'GOs'),
+                   _column_values(df, 'KEGGs'))
+        for gene, gos, keggs in rows:
+            gene = str(gene).strip()
             if not gene or gene == 'nan':
                 continue
             _ensure_gene(gene)
-            gene_go[gene].update(
-                _extract_terms(row.get('GOs', ''), separator=';', strip_scores=True)
-            )
-            gene_kegg[gene].update(
-                _extract_terms(row.get('KEGGs', ''), separator=';', strip_scores=True)
-            )
+            gene_go[gene].update(_extract_terms(gos, separator=';', strip_scores=True))
+            gene_kegg[gene].update(_extract_terms(keggs, separator=';', strip_scores=True))
         print(f"  ✓ Loaded EggNOG v7: {eggnog_v7_file}")
     else:
         print(f"  ⚠ EggNOG v7 file not found: {eggnog_v7_file}")
@@ -1268,14 +1294,11 @@ def _combine_sample(output_dir: str, sample: str):
         print("  No genes found across tools – skipping combined outputs.")
         return
 
-    rows_kie = []
-    for gene in all_genes:
-        rows_kie.append({
-            'gene': gene,
-            'GO': ', '.join(sorted(gene_go.get(gene, set()))),
-            'KEGG': ', '.join(sorted(gene_kegg.get(gene, set()))),
-        })
-    df_kie = pd.DataFrame(rows_kie)
+    df_kie = pd.DataFrame({
+        'gene': all_genes,
+        'GO': [', '.join(sorted(gene_go.get(gene, set()))) for gene in all_genes],
+        'KEGG': [', '.join(sorted(gene_kegg.get(gene, set()))) for gene in all_genes],
+    })
     output_kie = os.path.join(
         output_dir, f"{sample}_combined_kofam_interpro_eggnogv7_per_gene.xlsx"
     )
@@ -1287,14 +1310,14 @@ def _combine_sample(output_dir: str, sample: str):
 
     fantasia_found = False
     if os.path.exists(fantasia_file):
-        df = pd.read_excel(fantasia_file)
-        for _, row in df.iterrows():
-            gene = str(row.get('gene', '')).strip()
+        df = _read_per_gene(fantasia_file)
+        for gene, go in zip(_column_values(df, 'gene'), _column_values(df, 'GO')):
+            gene = str(gene).strip()
             if not gene or gene == 'nan':
                 continue
             gene_go_f.setdefault(gene, set())
             gene_kegg_f.setdefault(gene, set())
-            gene_go_f[gene].update(_extract_terms(row.get('GO', '')))
+            gene_go_f[gene].update(_extract_terms(go))
         fantasia_found = True
         print(f"  ✓ Loaded FANTASIA ProtT5: {fantasia_file}")
     else:
@@ -1302,14 +1325,11 @@ def _combine_sample(output_dir: str, sample: str):
               "combined KIEF file will equal KIE file.")
 
     all_genes_f = sorted(gene_go_f.keys() | gene_kegg_f.keys())
-    rows_kief = []
-    for gene in all_genes_f:
-        rows_kief.append({
-            'gene': gene,
-            'GO': ', '.join(sorted(gene_go_f.get(gene, set()))),
-            'KEGG': ', '.join(sorted(gene_kegg_f.get(gene, set()))),
-        })
-    df_kief = pd.DataFrame(rows_kief)
+    df_kief = pd.DataFrame({
+        'gene': all_genes_f,
+        'GO': [', '.join(sorted(gene_go_f.get(gene, set()))) for gene in all_genes_f],
+        'KEGG': [', '.join(sorted(gene_kegg_f.get(gene, set()))) for gene in all_genes_f],
+    })
     output_kief = os.path.join(
         output_dir, f"{sample}_combined_kofam_interpro_eggnogv7_fantasia_ProtT5_per_gene.xlsx"
     )
@@ -1370,6 +1390,9 @@ Examples:
 
   # Only run the combine step (per-gene files must already exist)
   %(prog)s --combine-only -o ./excel_outputs
+
+Excel files are written fastest with xlsxwriter installed; otherwise
+openpyxl is used, which is much faster with lxml installed.
         """
     )
     
@@ -1415,8 +1438,49 @@ Examples:
         help='Only combine existing per-gene Excel files (skip individual tool processing)'
     )
     
+    parser.add_argument(
+        '--cache',
+        action='store_true',
+        help='Cache parsed tool outputs as Parquet and reuse them while the input files are unchanged (requires pyarrow)'
+    )
+    
+    parser.add_argument(
+        '--cache-dir',
+        help='Directory for the Parquet cache (default: a .cache directory next to each input file)'
+    )
+    
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='Number of processes used to parse the tool outputs and write the Excel files; 1 runs everything in one process (default: 1)'
+    )
+    
+    parser.add_argument(
+        '--max-excel-rows',
+        type=int,
+        help='Write tables with more rows than this to a Parquet file next to the Excel file, which then only holds the first MAX_EXCEL_ROWS rows (requires pyarrow; default: no limit)'
+    )
+    
     args = parser.parse_args()
     
+    if args.jobs < 1:
+        print("Error: --jobs must be at least 1")
+        sys.exit(1)
+    
+    if args.max_excel_rows is not None:
+        if args.max_excel_rows < 1:
+            print("Error: --max-excel-rows must be at least 1")
+            sys.exit(1)
+        if pa_csv is None:
+            print("Error: --max-excel-rows requires pyarrow (pip install pyarrow)")
+            sys.exit(1)
+    
+    global USE_CACHE, CACHE_DIR, MAX_EXCEL_ROWS
+    USE_CACHE = args.cache
+    CACHE_DIR = os.path.abspath(args.cache_dir) if args.cache_dir else None
+    MAX_EXCEL_ROWS = args.max_excel_rows
+    
     # Resolve paths
     results_dir = os.path.abspath(args.results_dir)
     output_dir = os.path.abspath(args.output_dir)
@@ -1429,6 +1493,8 @@ Examples:
     print("="*60)
     print(f"Results directory: {results_dir}")
     print(f"Output directory:  {output_dir}")
+    if XLSX_ENGINE == 'openpyxl' and not OPENPYXL_LXML:
+        print("Note: install xlsxwriter or lxml for faster Excel writing")
     print()
     
     if args.combine_only:
@@ -1443,17 +1509,25 @@ Examples:
         process_all = not any([args.kofamscan_only, args.interproscan_only,
                                args.eggnog_only, args.fantasia_only])
 
-        if process_all or args.kofamscan_only:
-            process_kofamscan(results_dir, output_dir)
+        # Every input file is parsed and written independently, so the files
+        # of all tools are processed in parallel worker processes
+        with worker_pool(args.jobs) as executor:
+            steps = []
+            if process_all or args.kofamscan_only:
+                steps += process_kofamscan(results_dir, output_dir, executor)
+
+            if process_all or args.interproscan_only:
+                steps += process_interproscan(results_dir, output_dir, executor)
 
-        if process_all or args.interproscan_only:
-            process_interproscan(results_dir, output_dir)
+            if process_all or args.eggnog_only:
+                steps += process_eggnog(results_dir, output_dir, executor)
 
-        if process_all or args.eggnog_only:
-            process_eggnog(results_dir, output_dir)
+            if process_all or args.fantasia_only:
+                steps += process_fantasia(results_dir, output_dir, executor)
 
-        if process_all or args.fantasia_only:
-            process_fantasia(results_dir, output_dir)
+            # Report in input order as the workers finish
+            for step in steps:
+                print(step.result(), end='')
 
         # After individual processing, combine annotations
         if process_all:
@@ -16,20 +16,38 @@ Repository: aaronkiggen/Functional_Annotation_Pipeline
 """
 
 import argparse
+import contextlib
+import functools
+import io
 import os
+import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 
 try:
+    import numpy as np
     import pandas as pd
-    from openpyxl import load_workbook
+    from openpyxl import Workbook, load_workbook
+    from openpyxl.cell import WriteOnlyCell
     from openpyxl.styles import Font, PatternFill, Alignment
+    from openpyxl.utils import get_column_letter
 except ImportError:
     print("Error: Required packages not found.")
     print("Please install: pip install pandas openpyxl")
     sys.exit(1)
 
+# With pyarrow installed, pandas hands the summary TSV to pyarrow's
+# multithreaded CSV reader (its own C parser is used otherwise) and the
+# consensus result is also written as Parquet
+try:
+    import pyarrow  # noqa: F401
+    HAVE_PYARROW = True
+except ImportError:
+    HAVE_PYARROW = False
+CSV_ENGINE = 'pyarrow' if HAVE_PYARROW else 'c'
+
 
 # Model name mapping: Excel file names -> CSV column names
 MODEL_NAME_MAPPING = {
@@ -40,51 +58,147 @@ MODEL_NAME_MAPPING = {
     'ESM3c': 'ESM3c_L0'
 }
 
+# Rows of the summary TSV read at a time during consensus filtering
+CONSENSUS_CHUNK_ROWS = 100_000
+
+# Header style shared by every workbook written here, built once. Colours
+# are full ARGB values so the alpha channel is explicit (opaque).
+HEADER_FILL = PatternFill(start_color="FF366092", end_color="FF366092", fill_type="solid")
+HEADER_FONT = Font(bold=True, color="FFFFFFFF")
+HEADER_ALIGNMENT = Alignment(horizontal='center')
+
+# Picks the model out of a per-term Excel file name in one scan
+MODEL_FILE_PATTERN = re.compile(
+    '_fantasia_(' + '|'.join(map(re.escape, MODEL_NAME_MAPPING)) + ')_')
+
+# Model score columns in the FANTASIA summary
+MODEL_SCORE_COLUMNS = [
+    'final_score_ESM_L0',
+    'final_score_Prot-T5_L0',
+    'final_score_Prost-T5_L0',
+    'final_score_Ankh3-Large_L0',
+    'final_score_ESM3c_L0'
+]
+
+
+def write_styled_xlsx(output_path: str, sheet_name: str, columns, rows, max_lengths: List[int]):
+    """
+    Write a single-sheet workbook with the shared header style.
+    
+    Uses openpyxl's write-only mode, which streams rows to disk instead of
+    keeping a Cell object per value.
+    
+    Args:
+        output_path: Path to save the Excel file
+        sheet_name: Name of the worksheet
+        columns: Column names
+        rows: Iterable of row value tuples (None for empty cells)
+        max_lengths: Longest header or value per column, in characters;
+            columns are sized to this plus padding, capped at 60
+    """
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(sheet_name)
+    
+    # Column widths must be set before the first row is written
+    for i, max_length in enumerate(max_lengths):
+        worksheet.column_dimensions[get_column_letter(i + 1)].width = min(max_length + 2, 60)
+    
+    header = []
+    for col in columns:
+        cell = WriteOnlyCell(worksheet, value=col)
+        cell.fill = HEADER_FILL
+        cell.font = HEADER_FONT
+        cell.alignment = HEADER_ALIGNMENT
+        header.append(cell)
+    worksheet.append(header)
+    for row in rows:
+        worksheet.append(row)
+    workbook.save(output_path)
+
+
+def max_value_lengths(df: pd.DataFrame) -> List[int]:
+    """
+    Measure the longest header or value per column of a DataFrame, for
+    write_styled_xlsx's column widths.
+    
+    Args:
+        df: DataFrame about to be written
+        
+    Returns:
+        List of lengths in characters, in column order
+    """
+    lengths = []
+    for col in df.columns:
+        longest = df[col].astype(str).str.len().max()
+        if pd.isna(longest):
+            longest = 0
+        lengths.append(max(len(str(col)), int(longest)))
+    return lengths
+
 
 def parse_fasta_for_gene_mapping(fasta_path: str) -> Dict[str, str]:
     """
     Parse FASTA file to create protein-to-gene mapping.
     Extracts gene information from FASTA headers, now supporting BRAKER4 outputs.
     
+    The mapping is memoized per file path, modification time and size, so
+    an unchanged FASTA is only parsed once per process. Callers must treat
+    the returned dictionary as read-only.
+    
     Args:
         fasta_path: Path to protein FASTA file
         
     Returns:
         Dictionary mapping protein/transcript IDs to gene IDs
     """
-    protein_to_gene = {}
-    
     if not os.path.exists(fasta_path):
         print(f"Warning: FASTA file not found: {fasta_path}")
-        return protein_to_gene
+        return {}
+    
+    stat = os.stat(fasta_path)
+    return _parse_fasta_memoized(os.path.abspath(fasta_path), stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=4)
+def _parse_fasta_memoized(fasta_path: str, mtime_ns: int, size: int) -> Dict[str, str]:
+    """Memoized FASTA header scan; mtime_ns and size only serve as part of the key."""
+    protein_to_gene = {}
     
-    with open(fasta_path, 'r') as f:
+    # Binary mode: sequence lines are skipped without being decoded, and
+    # only the identifiers kept from each header are
+    with open(fasta_path, 'rb') as f:
         for line in f:
-            if line.startswith('>'):
-                # Parse header - assuming format like >protein_id gene=gene_id
-                # OR BRAKER4 native format: >g1.t1 (gene is g1, transcript is g1.t1)
-                header = line[1:].strip()
-                parts = header.split()
-                protein_id = parts[0]
-                
-                gene_id = protein_id  # Default to protein ID
-                
-                # 1. Try to extract gene ID from standard key/value headers
-                found_gene_tag = False
-                for part in parts:
-                    if part.startswith('gene='):
-                        gene_id = part.split('=')[1]
-                        found_gene_tag = True
-                        break
-                        
-                # 2. If no `gene=` tag (e.g. BRAKER4/TSEBRA output), parse transcript ID structure
-                if not found_gene_tag:
-                    # In BRAKER4, headers are often >g1.t1 or >jg1.t1
-                    if '.' in protein_id:
-                        # Extract the base gene name up to the last dot (e.g., "g1.t1" -> "g1")
-                        gene_id = protein_id.rsplit('.', 1)[0]
-                
-                protein_to_gene[protein_id] = gene_id
+            if line[:1] != b'>':
+                continue
+            
+            # Parse header - assuming format like >protein_id gene=gene_id
+            # OR BRAKER4 native format: >g1.t1 (gene is g1, transcript is g1.t1)
+            header = line[1:].strip()
+            if not header:
+                continue
+            
+            # Only split the whole header when it can hold a gene= tag
+            parts = header.split() if b'gene=' in header else header.split(None, 1)[:1]
+            protein_id = parts[0].decode()
+            
+            gene_id = protein_id  # Default to protein ID
+            
+            # 1. Try to extract gene ID from standard key/value headers
+            found_gene_tag = False
+            for part in parts:
+                if part.startswith(b'gene='):
+                    gene_id = part.split(b'=')[1].decode()
+                    found_gene_tag = True
+                    break
+                    
+            # 2. If no `gene=` tag (e.g. BRAKER4/TSEBRA output), parse transcript ID structure
+            if not found_gene_tag:
+                # In BRAKER4, headers are often >g1.t1 or >jg1.t1
+                if '.' in protein_id:
+                    # Extract the base gene name up to the last dot (e.g., "g1.t1" -> "g1")
+                    gene_id = protein_id.rsplit('.', 1)[0]
+            
+            protein_to_gene[protein_id] = gene_id
     
     return protein_to_gene
 
@@ -94,39 +208,33 @@ def calculate_thresholds(summary_df: pd.DataFrame) -> Dict[str, float]:
     Calculate 25th percentile (Q1) thresholds for each model.
     
     Args:
-        summary_df: DataFrame containing FANTASIA summary with model score columns
+        summary_df: DataFrame containing FANTASIA summary with model score
+            columns, already coerced to numbers (non-numeric values as NaN)
         
     Returns:
         Dictionary mapping model names to their Q1 threshold values
     """
     thresholds = {}
     
-    # Model columns in the summary CSV
-    model_columns = [
-        'final_score_ESM_L0',
-        'final_score_Prot-T5_L0',
-        'final_score_Prost-T5_L0',
-        'final_score_Ankh3-Large_L0',
-        'final_score_ESM3c_L0'
-    ]
-    
-    for col in model_columns:
-        if col in summary_df.columns:
-            # Get non-zero scores
-            scores = summary_df[col].dropna()
-            scores = pd.to_numeric(scores, errors='coerce')
-            non_zero_scores = scores[scores > 0]
-            
-            if len(non_zero_scores) > 0:
-                # Calculate 25th percentile (Q1)
-                q1 = non_zero_scores.quantile(0.25)
-                thresholds[col] = q1
-                print(f"  {col}: Q1 = {q1:.4f} (from {len(non_zero_scores)} non-zero scores)")
-            else:
-                print(f"  {col}: No non-zero scores found")
-                thresholds[col] = 0.0
-        else:
+    for col in MODEL_SCORE_COLUMNS:
+        if col not in summary_df.columns:
             print(f"  Warning: Column {col} not found in summary")
+    present_cols = [col for col in MODEL_SCORE_COLUMNS if col in summary_df.columns]
+    
+    # Take every column's Q1 of the non-zero scores in a single quantile
+    # call (zeros are masked out as NaN)
+    scores = summary_df[present_cols]
+    scores = scores.mask(scores <= 0)
+    q1 = scores.quantile(0.25)
+    counts = scores.count()
+    
+    for col in present_cols:
+        if counts[col] > 0:
+            thresholds[col] = q1[col]
+            print(f"  {col}: Q1 = {q1[col]:.4f} (from {counts[col]} non-zero scores)")
+        else:
+            print(f"  {col}: No non-zero scores found")
+            thresholds[col] = 0.0
     
     return thresholds
 
@@ -135,15 +243,47 @@ def filter_excel_file(excel_path: str, threshold: float, output_path: str):
     """
     Filter an Excel file based on final_score threshold.
     
+    When create_excel_outputs.py truncated the workbook (--max-excel-rows),
+    the full table is read from the Parquet copy next to it instead.
+    
     Args:
         excel_path: Path to input Excel file
         threshold: Minimum score threshold (Q1)
         output_path: Path to save filtered Excel file
     """
-    # Load the Excel file
-    df = pd.read_excel(excel_path, sheet_name='Annotations')
+    parquet_path = os.path.splitext(excel_path)[0] + '.parquet'
+    if os.path.exists(parquet_path):
+        if not HAVE_PYARROW:
+            print(f"  Warning: {os.path.basename(excel_path)} only holds the first rows of "
+                  f"{parquet_path}, which requires pyarrow to read; skipped")
+            return
+        header, kept_rows, max_lengths, original_count = _filter_parquet(
+            parquet_path, threshold)
+    else:
+        header, kept_rows, max_lengths, original_count = _filter_workbook(
+            excel_path, threshold)
+    
+    filtered_count = len(kept_rows)
+    removed_count = original_count - filtered_count
+    
+    # Save filtered data
+    if kept_rows:
+        write_styled_xlsx(output_path, 'Annotations', header, kept_rows, max_lengths)
+        
+        print(f"  Filtered: {os.path.basename(excel_path)}")
+        print(f"    Kept: {filtered_count}/{original_count} rows (removed {removed_count})")
+    else:
+        print(f"  Warning: All rows filtered out for {excel_path}")
+
+
+def _filter_parquet(parquet_path: str, threshold: float) -> Tuple[List, List[tuple], List[int], int]:
+    """
+    Filter the full Parquet copy of a per-term table (see filter_excel_file).
     
-    original_count = len(df)
+    Returns:
+        Tuple of (header, kept rows, longest value per column, original row count)
+    """
+    df = pd.read_parquet(parquet_path)
     
     # Filter rows where final_score >= threshold
     if 'final_score' in df.columns:
@@ -151,56 +291,90 @@ def filter_excel_file(excel_path: str, threshold: float, output_path: str):
         df['final_score'] = pd.to_numeric(df['final_score'], errors='coerce')
         filtered_df = df[df['final_score'] >= threshold]
     else:
-        print(f"  Warning: 'final_score' column not found in {excel_path}")
+        print(f"  Warning: 'final_score' column not found in {parquet_path}")
         filtered_df = df
     
-    filtered_count = len(filtered_df)
-    removed_count = original_count - filtered_count
+    values = filtered_df.astype(object).where(filtered_df.notna(), None)
+    kept_rows = list(values.itertuples(index=False, name=None))
+    return list(filtered_df.columns), kept_rows, max_value_lengths(filtered_df), len(df)
+
+
+def _filter_workbook(excel_path: str, threshold: float) -> Tuple[List, List[tuple], List[int], int]:
+    """
+    Filter the Annotations sheet of a per-term workbook (see filter_excel_file).
     
-    # Save filtered data
-    if not filtered_df.empty:
-        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-            filtered_df.to_excel(writer, index=False, sheet_name='Annotations')
-            
-            # Format header
-            workbook = writer.book
-            worksheet = writer.sheets['Annotations']
-            
-            header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            header_font = Font(bold=True, color="FFFFFF")
-            
-            for cell in worksheet[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal='center')
+    Returns:
+        Tuple of (header, kept rows, longest value per column, original row count)
+    """
+    # Stream the sheet: read-only mode yields plain value tuples instead of
+    # building Cell objects, and only the rows that pass are kept. Column
+    # widths are tracked on the way, as the output needs them up front.
+    workbook_in = load_workbook(excel_path, read_only=True, data_only=True)
+    try:
+        rows_in = workbook_in['Annotations'].iter_rows(values_only=True)
+        header = list(next(rows_in, ()))
+        while header and header[-1] is None:
+            header.pop()
+        max_lengths = [len(str(col)) for col in header]
+        
+        score_idx = header.index('final_score') if 'final_score' in header else None
+        if score_idx is None:
+            print(f"  Warning: 'final_score' column not found in {excel_path}")
+        
+        original_count = 0
+        kept_rows = []
+        for row in rows_in:
+            # Read-only mode drops trailing blank cells, so rows can be
+            # shorter than the header
+            row = tuple(row[:len(header)]) + (None,) * (len(header) - len(row))
+            if all(value is None for value in row):
+                continue
+            original_count += 1
             
-            # Adjust column widths
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                for cell in column:
+            # Filter rows where final_score >= threshold
+            if score_idx is not None:
+                # Convert to numeric, handling any non-numeric values
+                score = row[score_idx]
+                if isinstance(score, str):
                     try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 60)
-                worksheet.column_dimensions[column_letter].width = adjusted_width
-        
-        print(f"  Filtered: {os.path.basename(excel_path)}")
-        print(f"    Kept: {filtered_count}/{original_count} rows (removed {removed_count})")
-    else:
-        print(f"  Warning: All rows filtered out for {excel_path}")
+                        score = float(score)
+                    except ValueError:
+                        continue
+                    row = row[:score_idx] + (score,) + row[score_idx + 1:]
+                if not isinstance(score, (int, float)) or not score >= threshold:
+                    continue
+            
+            kept_rows.append(row)
+            for i, value in enumerate(row):
+                if value is not None and len(str(value)) > max_lengths[i]:
+                    max_lengths[i] = len(str(value))
+    finally:
+        workbook_in.close()
+    
+    return header, kept_rows, max_lengths, original_count
 
 
-def process_individual_excel_files(excel_dir: str, thresholds: Dict[str, float], output_dir: str):
+def _filter_excel_task(task: Tuple[str, float, str]) -> str:
+    """Run filter_excel_file in a worker process and return what it printed"""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        filter_excel_file(*task)
+    return output.getvalue()
+
+
+def process_individual_excel_files(excel_dir: str, thresholds: Dict[str, float], output_dir: str,
+                                   jobs: int = 1):
     """
     Task A: Filter individual Excel files based on model-specific thresholds.
     
+    Each file is independent, so with jobs > 1 they are filtered in
+    parallel worker processes; their messages are still printed in file order.
+    
     Args:
         excel_dir: Directory containing Excel files
         thresholds: Dictionary of model thresholds
         output_dir: Directory to save filtered outputs
+        jobs: Number of worker processes; 1 filters the files in this process
     """
     print("\n" + "="*60)
     print("Task A: Filtering Individual Excel Files")
@@ -215,16 +389,14 @@ def process_individual_excel_files(excel_dir: str, thresholds: Dict[str, float],
     
     print(f"Found {len(excel_files)} Excel file(s)")
     
+    tasks = []
     for excel_file in excel_files:
         excel_path = str(excel_file)
         filename = excel_file.name
         
         # Determine which model this file corresponds to
-        model_name = None
-        for excel_model in MODEL_NAME_MAPPING.keys():
-            if f'_fantasia_{excel_model}_' in filename:
-                model_name = excel_model
-                break
+        match = MODEL_FILE_PATTERN.search(filename)
+        model_name = match.group(1) if match else None
         
         if not model_name:
             print(f"  Warning: Could not determine model for {filename}")
@@ -244,61 +416,70 @@ def process_individual_excel_files(excel_dir: str, thresholds: Dict[str, float],
         output_filename = filename.replace('_per_term.xlsx', '_per_term_filtered.xlsx')
         output_path = os.path.join(output_dir, output_filename)
         
-        # Filter the Excel file
-        filter_excel_file(excel_path, threshold, output_path)
+        tasks.append((excel_path, threshold, output_path))
+    
+    # Filter the Excel files
+    workers = min(jobs, len(tasks))
+    if workers <= 1:
+        for task in tasks:
+            filter_excel_file(*task)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for output in executor.map(_filter_excel_task, tasks):
+                print(output, end='')
 
 
 def create_consensus_filtering(summary_path: str, thresholds: Dict[str, float], 
-                               output_dir: str, fasta_path: Optional[str] = None):
+                               output_dir: str, fasta_path: Optional[str] = None,
+                               write_csv: bool = True):
     """
     Task B: Create consensus filtering with majority vote (>=3/5 models).
     
+    The summary is streamed in blocks of CONSENSUS_CHUNK_ROWS rows and only
+    the rows passing the vote are kept, so memory follows the size of the
+    consensus result rather than of the whole summary.
+    
     Args:
         summary_path: Path to FANTASIA summary CSV
         thresholds: Dictionary of model thresholds
         output_dir: Directory to save consensus results
         fasta_path: Optional path to FASTA file for gene mapping
+        write_csv: Also save the result as CSV (it is always saved as Excel,
+            and as Parquet when pyarrow is installed)
     """
     print("\n" + "="*60)
     print("Task B: Consensus Filtering (Majority Vote >= 3/5)")
     print("="*60)
     
-    # Load summary CSV
-    summary_df = pd.read_csv(summary_path, sep='\t')
-    print(f"Loaded summary with {len(summary_df)} rows")
-    
-    # Model score columns
-    model_columns = [
-        'final_score_ESM_L0',
-        'final_score_Prot-T5_L0',
-        'final_score_Prost-T5_L0',
-        'final_score_Ankh3-Large_L0',
-        'final_score_ESM3c_L0'
-    ]
-    
-    # Apply thresholds and calculate consensus
-    consensus_votes = []
-    
-    for idx, row in summary_df.iterrows():
-        vote_count = 0
+    total_rows = 0
+    vote_dist = np.zeros(len(MODEL_SCORE_COLUMNS) + 1, dtype=np.int64)
+    kept = []
+    for chunk in pd.read_csv(summary_path, sep='\t', chunksize=CONSENSUS_CHUNK_ROWS):
+        # Apply thresholds and calculate consensus: coerce the score block once and
+        # compare it against the per-model thresholds in a single broadcast
+        # (missing/non-numeric scores compare as NaN and never vote)
+        present_cols = [col for col in MODEL_SCORE_COLUMNS
+                        if col in chunk.columns and col in thresholds]
+        threshold_vec = np.array([thresholds[col] for col in present_cols], dtype=np.float64)
+        scores = chunk[present_cols].apply(pd.to_numeric, errors='coerce')
+        scores = scores.to_numpy(dtype=np.float64, na_value=np.nan)
+        votes = (scores >= threshold_vec).sum(axis=1).astype(np.int8)
         
-        for col in model_columns:
-            if col in summary_df.columns and col in thresholds:
-                score = pd.to_numeric(row[col], errors='coerce')
-                if pd.notna(score) and score >= thresholds[col]:
-                    vote_count += 1
+        total_rows += len(chunk)
+        vote_dist += np.bincount(votes, minlength=len(vote_dist))
         
-        consensus_votes.append(vote_count)
+        # Filter for majority vote (>= 3)
+        chunk['consensus_vote'] = votes
+        kept.append(chunk[votes >= 3])
     
-    summary_df['consensus_vote'] = consensus_votes
+    consensus_df = pd.concat(kept, ignore_index=True)
     
-    # Filter for majority vote (>= 3)
-    consensus_df = summary_df[summary_df['consensus_vote'] >= 3].copy()
-    
-    print(f"Entries passing consensus filter: {len(consensus_df)}/{len(summary_df)}")
+    print(f"Loaded summary with {total_rows} rows")
+    print(f"Entries passing consensus filter: {len(consensus_df)}/{total_rows}")
     print(f"  Vote distribution:")
-    vote_dist = summary_df['consensus_vote'].value_counts().sort_index()
-    for vote, count in vote_dist.items():
+    for vote, count in enumerate(vote_dist):
+        if count == 0:
+            continue
         marker = "✓" if vote >= 3 else " "
         print(f"    {marker} {vote} votes: {count} entries")
     
@@ -308,45 +489,35 @@ def create_consensus_filtering(summary_path: str, thresholds: Dict[str, float],
         protein_to_gene = parse_fasta_for_gene_mapping(fasta_path)
         
         if protein_to_gene and 'accession' in consensus_df.columns:
-            consensus_df['gene_id'] = consensus_df['accession'].map(protein_to_gene)
-            # If mapping fails, use accession as gene_id
-            consensus_df['gene_id'] = consensus_df['gene_id'].fillna(consensus_df['accession'])
+            # Look each distinct accession up once (a protein has a row per GO
+            # term) and spread the genes back by category code. If mapping
+            # fails, use accession as gene_id; code -1 (missing accession)
+            # picks the trailing NaN.
+            accessions = consensus_df['accession'].astype('category')
+            genes = [protein_to_gene.get(acc, acc) for acc in accessions.cat.categories]
+            genes = np.array(genes + [np.nan], dtype=object)
+            consensus_df['gene_id'] = genes[accessions.cat.codes.to_numpy()]
             print(f"  Mapped {len(protein_to_gene)} proteins to genes")
     
     # Save consensus result as CSV
-    output_csv = os.path.join(output_dir, 'fantasia_consensus_majority.csv')
-    consensus_df.to_csv(output_csv, index=False)
-    print(f"\n✓ Saved consensus result: {output_csv}")
+    print()
+    if write_csv:
+        output_csv = os.path.join(output_dir, 'fantasia_consensus_majority.csv')
+        consensus_df.to_csv(output_csv, index=False)
+        print(f"✓ Saved consensus result: {output_csv}")
+    
+    # Parquet keeps the column types and is much quicker to write and load
+    # than CSV for downstream tools
+    if HAVE_PYARROW:
+        output_parquet = os.path.join(output_dir, 'fantasia_consensus_majority.parquet')
+        consensus_df.to_parquet(output_parquet, engine='pyarrow', compression='zstd', index=False)
+        print(f"✓ Saved consensus result: {output_parquet}")
     
     # Also save as Excel with formatting
     output_xlsx = os.path.join(output_dir, 'fantasia_consensus_majority.xlsx')
-    with pd.ExcelWriter(output_xlsx, engine='openpyxl') as writer:
-        consensus_df.to_excel(writer, index=False, sheet_name='Consensus')
-        
-        # Format header
-        workbook = writer.book
-        worksheet = writer.sheets['Consensus']
-        
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF")
-        
-        for cell in worksheet[1]:
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center')
-        
-        # Adjust column widths
-        for column in worksheet.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 60)
-            worksheet.column_dimensions[column_letter].width = adjusted_width
+    values = consensus_df.astype(object).where(consensus_df.notna(), None)
+    write_styled_xlsx(output_xlsx, 'Consensus', consensus_df.columns,
+                      values.itertuples(index=False, name=None), max_value_lengths(consensus_df))
     
     print(f"✓ Saved consensus result: {output_xlsx}")
 
@@ -391,9 +562,26 @@ Examples:
         help='Directory to save filtered outputs (default: same as excel-dir)'
     )
     
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='Number of processes used to filter the per-model Excel files; 1 filters them one by one (default: 1)'
+    )
+    
+    parser.add_argument(
+        '--no-csv',
+        action='store_true',
+        help='Do not write the consensus result as CSV (it is still written as Excel, and as Parquet when pyarrow is installed)'
+    )
+    
     args = parser.parse_args()
     
     # Validate inputs
+    if args.jobs < 1:
+        print("Error: --jobs must be at least 1")
+        sys.exit(1)
+    
     if not os.path.exists(args.summary):
         print(f"Error: Summary file not found: {args.summary}")
         sys.exit(1)
@@ -420,18 +608,25 @@ Examples:
     print("Calculating 25th Percentile Thresholds")
     print("="*60)
     
-    summary_df = pd.read_csv(args.summary, sep='\t')
+    # The thresholds only need the score columns; Task B streams the whole file
+    header = pd.read_csv(args.summary, sep='\t', nrows=0).columns
+    score_cols = [col for col in MODEL_SCORE_COLUMNS if col in header]
+    summary_df = pd.read_csv(args.summary, sep='\t', engine=CSV_ENGINE, usecols=score_cols)
+    # Coerce once here, handling any non-numeric values
+    summary_df = summary_df.apply(pd.to_numeric, errors='coerce')
     thresholds = calculate_thresholds(summary_df)
+    del summary_df
     
     if not thresholds:
         print("Error: No thresholds calculated")
         sys.exit(1)
     
     # Task A: Filter individual Excel files
-    process_individual_excel_files(args.excel_dir, thresholds, output_dir)
+    process_individual_excel_files(args.excel_dir, thresholds, output_dir, args.jobs)
     
     # Task B: Create consensus filtering
-    create_consensus_filtering(args.summary, thresholds, output_dir, args.fasta)
+    create_consensus_filtering(args.summary, thresholds, output_dir, args.fasta,
+                               write_csv=not args.no_csv)
     
     print("\n" + "="*60)
     print("Filtering Complete!")
@@ -0,0 +1,41 @@
+"""Tests for filter_fantasia_results.py."""
+
+import os
+import sys
+import tempfile
+import unittest
+
+from openpyxl import Workbook, load_workbook
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import filter_fantasia_results  # noqa: E402
+
+
+class FilterWorkbookTest(unittest.TestCase):
+
+    def test_short_row_with_blank_final_score_is_dropped(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            excel_path = os.path.join(tmp, 'sample_ESM-2_GO.xlsx')
+            output_path = os.path.join(tmp, 'filtered.xlsx')
+
+            # A write-only workbook leaves trailing blank cells out, so
+            # read-only mode returns the last row shorter than the header
+            workbook = Workbook(write_only=True)
+            sheet = workbook.create_sheet('Annotations')
+            sheet.append(['gene', 'go_id', 'final_score'])
+            sheet.append(['g1', 'GO:0000001', 0.9])
+            sheet.append(['g2', 'GO:0000002', 0.1])
+            sheet.append(['g3', 'GO:0000003'])
+            workbook.save(excel_path)
+
+            filter_fantasia_results.filter_excel_file(excel_path, 0.5, output_path)
+
+            rows = list(load_workbook(output_path, read_only=True)['Annotations']
+                        .iter_rows(values_only=True))
+            self.assertEqual(rows, [('gene', 'go_id', 'final_score'),
+                                    ('g1', 'GO:0000001', 0.9)])
+
+
+if __name__ == '__main__':
+    unittest.main()